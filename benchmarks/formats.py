@@ -0,0 +1,38 @@
+"""
+A micro benchmark of the decoding and validity check of the built-in formats.
+
+    PYTHONPATH=src python benchmarks/formats.py [--number N]
+"""
+import argparse
+import timeit
+
+from pyjschema.string import DEFAULT_FORMATS
+
+SAMPLES = {
+    'uuid': '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a',
+    'date-time': '2018-11-13T20:20:39Z',
+    'time': '20:20:39+00:00',
+    'date': '2018-11-13',
+    'duration': 'P3DT12H30M5.5S',
+    'email': 'test12@gmail.com',
+    'ipv4': '192.168.100.200',
+    'ipv6': '2001:0000:130F:0000:0000:09C0:876A:130B',
+    'hostname': 'api.eu-west-1.example.com',
+}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--number', type=int, default=100_000, help='calls of every method')
+    args = arg_parser.parse_args()
+
+    print(f'{"format":<12}{"decode (ns)":>14}{"is_valid (ns)":>16}')
+    for formatter in map(lambda f: f(), DEFAULT_FORMATS):
+        raw = SAMPLES[formatter.symbol]
+        decode = timeit.timeit(lambda: formatter.decode(raw), number=args.number) / args.number
+        is_valid = timeit.timeit(lambda: formatter.is_valid(raw), number=args.number) / args.number
+        print(f'{formatter.symbol:<12}{decode * 1e9:>14.0f}{is_valid * 1e9:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,7 @@
 
-from pyjschema.load import loads, loado, JsonSchemaParser
+from pyjschema.load import loads, loado, loads_many, iter_load, iter_items, load_file, get_parser, clear_cache, \
+    cache_info, set_cache_size, JsonSchemaParser
 from pyjschema.string.formatter import Formatter
+from pyjschema.backend import JsonBackend, get_backend, set_default_backend
+from pyjschema.record import Record
+from pyjschema.artifact import ParserStore
@@ -0,0 +1,176 @@
+import json
+from collections.abc import Sequence
+from typing import Callable, Optional, Iterable, Iterator
+
+from pyjschema.canonical import canonical
+from pyjschema.node import Node, NeverNode
+
+
+class ArrayNode(Node):
+
+    def __init__(self, schema: dict, compile_: Callable[[dict], Node]):
+        self.min_items = schema.get('minItems')
+        self.max_items = schema.get('maxItems')
+        self.unique_items = schema.get('uniqueItems') is True
+
+        self.contains: Optional[Node] = None
+        self.min_contains, self.max_contains = 1, None
+        if 'contains' in schema:
+            self.contains = compile_(schema['contains'])
+            self.min_contains = schema.get('minContains', 1)
+            self.max_contains = schema.get('maxContains', None)
+
+        self.prefix_items: Optional[list[Node]] = \
+            [compile_(sub_schema) for sub_schema in schema['prefixItems']] if 'prefixItems' in schema else None
+
+        items = schema.get('items')
+        if items is False:
+            self.items: Optional[Node] = NeverNode('more items are not allowed')
+        else:
+            self.items = compile_(items) if 'items' in schema else None
+
+    def parse(self, obj):
+        if not isinstance(obj, list):
+            raise ValueError('value is not an array')
+
+        self._validate_array_range(obj)
+
+        contains_count = 0
+        ret, unique_check = [], set()
+        for i, item in enumerate(obj):
+            if self.unique_items:
+                key = canonical(item)
+                if key in unique_check:
+                    raise ValueError('array values are not unique')
+                unique_check.add(key)
+
+            if self.contains is not None and self.contains.is_valid(item):
+                contains_count += 1
+
+            ret.append(self._handle_array_item(i, item))
+
+        if self.contains is not None and \
+                (contains_count < self.min_contains or
+                 (self.max_contains is not None and contains_count > self.max_contains)):
+            raise ValueError('value does not comply with the "contains" rules')
+
+        return ret
+
+    def encode(self, obj):
+        if not isinstance(obj, Sequence) or isinstance(obj, (str, bytes)):
+            return obj
+
+        prefix_items = self.prefix_items or ()
+        ret = [node.encode(item) for node, item in zip(prefix_items, obj)]
+        if self.items is not None:
+            ret += [self.items.encode(obj[i]) for i in range(len(prefix_items), len(obj))]
+        else:
+            ret += obj[len(prefix_items):]
+
+        return ret
+
+    def iter_encode(self, obj, encoder: json.JSONEncoder) -> Iterator[str]:
+        if not isinstance(obj, Sequence) or isinstance(obj, (str, bytes)) or not obj:
+            yield encoder.encode(self.encode(obj))
+            return
+
+        prefix_items = self.prefix_items or ()
+        separator = '['
+        for i, item in enumerate(obj):
+            yield separator
+            node = prefix_items[i] if i < len(prefix_items) else self.items
+            if node is not None:
+                yield from node.iter_encode(item, encoder)
+            else:
+                yield encoder.encode(item)
+
+            separator = encoder.item_separator
+
+        yield ']'
+
+    def is_valid(self, obj) -> bool:
+        if not isinstance(obj, list) or \
+                (self.min_items is not None and len(obj) < self.min_items) or \
+                (self.max_items is not None and len(obj) > self.max_items):
+            return False
+
+        if self.unique_items and not _all_unique(obj):
+            return False
+
+        if self.contains is not None:
+            contains_count = sum(self.contains.is_valid(item) for item in obj)
+            if contains_count < self.min_contains or \
+                    (self.max_contains is not None and contains_count > self.max_contains):
+                return False
+
+        prefix_items = self.prefix_items or ()
+        for node, item in zip(prefix_items, obj):
+            if not node.is_valid(item):
+                return False
+
+        if self.items is not None:
+            for i in range(len(prefix_items), len(obj)):
+                if not self.items.is_valid(obj[i]):
+                    return False
+
+        return True
+
+    def iter_parse(self, items: Iterable) -> Iterator:
+        """
+        Like parse(), for the items of an array that arrive one at a time. Each item is parsed and yielded as soon as it
+        arrives, "maxItems" and "uniqueItems" fail as soon as they are broken and the rest of the rules at the end.
+
+        :param items: the items of the array
+        """
+        contains_count, count, unique_check = 0, 0, set()
+        for i, item in enumerate(items):
+            if self.max_items is not None and i >= self.max_items:
+                raise ValueError('array length does not match "maxItems"')
+
+            if self.unique_items:
+                key = canonical(item)
+                if key in unique_check:
+                    raise ValueError('array values are not unique')
+                unique_check.add(key)
+
+            if self.contains is not None and self.contains.is_valid(item):
+                contains_count += 1
+
+            yield self._handle_array_item(i, item)
+            count = i + 1
+
+        if self.min_items is not None and count < self.min_items:
+            raise ValueError('array length does not match "minItems"')
+
+        if self.contains is not None and \
+                (contains_count < self.min_contains or
+                 (self.max_contains is not None and contains_count > self.max_contains)):
+            raise ValueError('value does not comply with the "contains" rules')
+
+    def _validate_array_range(self, obj: list):
+        if self.min_items is not None and len(obj) < self.min_items:
+            raise ValueError('array length does not match "minItems"')
+
+        if self.max_items is not None and len(obj) > self.max_items:
+            raise ValueError('array length does not match "maxItems"')
+
+    def _handle_array_item(self, index: int, item):
+        if self.prefix_items is not None and index < len(self.prefix_items):
+            return self.prefix_items[index].parse(item)
+
+        if self.items is not None:
+            return self.items.parse(item)
+
+        return item
+
+
+def _all_unique(items: list) -> bool:
+    # by the equality of json schema, stopping at the first duplicate
+    keys = set()
+    for item in items:
+        key = canonical(item)
+        if key in keys:
+            return False
+        keys.add(key)
+
+    return True
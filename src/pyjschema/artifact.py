@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Optional, Type
+
+from pyjschema.cache import LRUCache
+from pyjschema.load import JsonSchemaParser
+from pyjschema.stream import map_file
+from pyjschema.string import Formatter, DEFAULT_FORMATS
+
+# changes when the layout of the stored artifacts changes
+ARTIFACT_FORMAT = 1
+
+_SUFFIX = '.pjs'
+
+
+class ParserStore:
+    """
+    An on-disk cache of compiled parsers, so processes that parse with the same schemas compile each schema once and
+    later processes load the compiled parser (its compiled nodes, resolved refs, regexes and dispatch tables).
+
+    Artifacts are keyed by a hash of the schema, the parser options and the formatters (with the state of formatter
+    instances, e.g. their cache size). An artifact of another version of the library is stale, it is compiled again
+    and replaced. Parsers that can not be keyed or pickled are compiled without an artifact.
+
+    Artifacts are pickles and loading one can run any code, so only use a directory that untrusted users can not write.
+
+    :param directory: the directory of the artifacts, created if it does not exist
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, schema: Optional[dict] = None, extended_formats: Optional[list[Type[Formatter] | Formatter]] = None,
+            **options) -> JsonSchemaParser:
+        """
+        Returns the parser of the schema, loaded from its artifact or compiled (and stored) if there is no valid one.
+
+        :param schema: the schema to check according to
+        :param extended_formats: more formats for string parsing
+        :param options: more JsonSchemaParser parameters, e.g. backend="codegen"
+        """
+        try:
+            formats = _formats_key(extended_formats)
+            path = self.path(schema, extended_formats, **options)
+        except (TypeError, ValueError):
+            # e.g. an option that has no stable json form, the parser is used without an artifact
+            return JsonSchemaParser(schema, extended_formats=extended_formats, **options)
+
+        parser = self._load(path, formats)
+        if parser is None:
+            parser = JsonSchemaParser(schema, extended_formats=extended_formats, **options)
+            self._store(path, formats, parser)
+
+        return parser
+
+    def path(self, schema: Optional[dict] = None, extended_formats: Optional[list[Type[Formatter] | Formatter]] = None,
+             **options) -> Path:
+        """
+        Returns the path of the artifact of the schema with the formatters and the parser options. Raises a TypeError
+        or a ValueError if they have no stable json form.
+        """
+        # the order of the schema's keys changes the parser (see fingerprint()), the options' order does not
+        key = json.dumps({'schema': schema, 'formats': _formats_key(extended_formats),
+                          'options': dict(sorted(options.items()))}, default=_stable)
+        return self.directory / (hashlib.sha256(key.encode()).hexdigest() + _SUFFIX)
+
+    def clear(self):
+        """
+        Removes all the artifacts.
+        """
+        for path in self.directory.glob('*' + _SUFFIX):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _load(path: Path, formats: list[str]) -> Optional[JsonSchemaParser]:
+        # noinspection PyBroadException
+        try:
+            with map_file(path) as buffer:
+                artifact = pickle.loads(buffer)
+        except Exception:
+            # a missing or corrupted artifact, or one of classes that changed
+            return None
+
+        if not isinstance(artifact, dict) or artifact.get('format') != ARTIFACT_FORMAT or \
+                artifact.get('version') != library_version() or artifact.get('formats') != formats:
+            return None
+
+        return artifact['parser']
+
+    def _store(self, path: Path, formats: list[str], parser: JsonSchemaParser):
+        artifact = {'format': ARTIFACT_FORMAT, 'version': library_version(), 'formats': formats, 'parser': parser}
+        try:
+            data = pickle.dumps(artifact, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            # e.g. a formatter class defined in a function or a deeply nested schema, the parser is used without an
+            # artifact
+            return
+
+        # written to a temporary file and renamed, so other processes never read a partial artifact
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+@lru_cache(maxsize=None)
+def library_version() -> str:
+    """
+    Returns the version of the library, with a fingerprint of its source files, so a changed library is detected even
+    without a new version number.
+    """
+    try:
+        version = metadata.version('pyjschema')
+    except metadata.PackageNotFoundError:
+        version = 'unknown'
+
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.rglob('*.py')):
+        stat = path.stat()
+        digest.update(f'{path.relative_to(Path(__file__).parent)}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+
+    return f'{version}+{digest.hexdigest()[:16]}'
+
+
+def _formats_key(extended_formats: Optional[list[Type[Formatter] | Formatter]]) -> list[str]:
+    formats = list(DEFAULT_FORMATS) + list(extended_formats or ())
+    return [_format_key(f) for f in formats]
+
+
+def _format_key(formatter: Type[Formatter] | Formatter) -> str:
+    if isinstance(formatter, type):
+        return f'{formatter.symbol}={_qualified_name(formatter)}'
+
+    # an instance with its state, e.g. the size of its cache
+    state = json.dumps(vars(formatter), sort_keys=True, default=_stable)
+    return f'{formatter.symbol}={_qualified_name(type(formatter))}{state}'
+
+
+def _stable(value):
+    # the json form of the key values that json does not support. Unlike repr(), it has no memory addresses, which
+    # change between processes
+    if isinstance(value, type):
+        return _qualified_name(value)
+
+    if isinstance(value, LRUCache):
+        return {'maxsize': value.info().maxsize}
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+
+    if not hasattr(value, '__dict__'):
+        raise TypeError(f'{type(value).__name__} has no stable json form')
+
+    return {'type': _qualified_name(type(value)), 'state': vars(value)}
+
+
+def _qualified_name(cls: type) -> str:
+    return f'{cls.__module__}.{cls.__qualname__}'
@@ -0,0 +1,155 @@
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+Raw = str | bytes | bytearray | memoryview
+
+
+class JsonBackend:
+    """
+    A json decoder and encoder. The fast backends decode bytes (or any buffer) directly, without decoding them to a
+    str first. Their encoding is compact, without spaces after separators and with non ascii characters as they are.
+    They decode the values the stdlib decodes, except for integers that do not fit in 64 bits (see FastBackend).
+    """
+
+    name: str = None
+    available: bool = True
+
+    def loads(self, raw: Raw) -> Any:
+        """
+        Decodes a json, raises a ValueError if it is not valid.
+        """
+        raise NotImplementedError
+
+    def dumps(self, obj) -> str:
+        """
+        Encodes an object of json types, raises a TypeError for other types.
+        """
+        raise NotImplementedError
+
+
+class StdlibBackend(JsonBackend):
+    name = 'stdlib'
+
+    def loads(self, raw: Raw) -> Any:
+        return json.loads(bytes(raw) if isinstance(raw, memoryview) else raw)
+
+    def dumps(self, obj) -> str:
+        return json.dumps(obj)
+
+
+_STDLIB = StdlibBackend()
+
+
+class FastBackend(JsonBackend):
+    """
+    A backend of a fast decoder, used only when it is asked for. The jsons the decoder rejects are decoded by the
+    stdlib, so NaN, Infinity and numbers out of the float range (e.g. 1e400) are decoded like the stdlib decodes them,
+    and the objects the encoder rejects (e.g. integers that do not fit in 64 bits) are encoded by the stdlib.
+
+    Unlike the stdlib, integers that do not fit in 64 bits are decoded to (inexact) floats by orjson. Scanning every
+    json for them would cost more than decoding it, so documents with such integers should use the "stdlib" backend.
+    """
+
+    def loads(self, raw: Raw) -> Any:
+        try:
+            return self._loads(raw)
+        except ValueError:
+            # the stdlib decodes NaN, Infinity and 1e400, and raises its own error for an invalid json
+            return _STDLIB.loads(raw)
+
+    def dumps(self, obj) -> str:
+        try:
+            return self._dumps(obj)
+        except TypeError:
+            # the stdlib encodes any integer, and raises its own error for other types
+            return _STDLIB.dumps(obj)
+
+    def _loads(self, raw: Raw) -> Any:
+        raise NotImplementedError
+
+    def _dumps(self, obj) -> str:
+        raise NotImplementedError
+
+
+class OrjsonBackend(FastBackend):
+    name = 'orjson'
+    available = orjson is not None
+
+    def _loads(self, raw: Raw) -> Any:
+        # orjson.JSONDecodeError is a ValueError
+        return orjson.loads(raw)
+
+    def _dumps(self, obj) -> str:
+        # orjson.JSONEncodeError is a TypeError
+        return orjson.dumps(obj).decode()
+
+
+class MsgspecBackend(FastBackend):
+    name = 'msgspec'
+    available = msgspec is not None
+
+    def _loads(self, raw: Raw) -> Any:
+        try:
+            return msgspec.json.decode(raw)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+
+    def _dumps(self, obj) -> str:
+        try:
+            return msgspec.json.encode(obj).decode()
+        except msgspec.EncodeError as e:
+            raise TypeError(str(e))
+
+
+# the stdlib is the default, the fast backends decode and encode some values differently (see FastBackend)
+BACKENDS: dict[str, type[JsonBackend]] = {
+    OrjsonBackend.name: OrjsonBackend,
+    MsgspecBackend.name: MsgspecBackend,
+    StdlibBackend.name: StdlibBackend,
+}
+
+_default: Optional[JsonBackend] = None
+
+
+def get_backend(backend: Optional[str | JsonBackend] = None) -> JsonBackend:
+    """
+    Returns a json backend by its name ("orjson", "msgspec" or "stdlib"), the default one for None, which is the
+    stdlib unless another one is pinned by set_default_backend().
+
+    :param backend: the name of the backend, a backend instance or None
+    """
+    if isinstance(backend, JsonBackend):
+        return backend
+
+    if backend is None:
+        return _default if _default is not None else _STDLIB
+
+    if backend not in BACKENDS:
+        raise ValueError(f'json backend "{backend}" is not supported')
+
+    backend_type = BACKENDS[backend]
+    if not backend_type.available:
+        raise ValueError(f'json backend "{backend}" is not installed')
+
+    return backend_type()
+
+
+def set_default_backend(backend: Optional[str | JsonBackend]):
+    """
+    Pins the default json backend of the process, None goes back to the stdlib.
+
+    :param backend: the name of the backend, a backend instance or None
+    """
+    global _default
+    _default = get_backend(backend) if backend is not None else None
+
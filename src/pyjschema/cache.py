@@ -0,0 +1,99 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple, Optional, Any
+
+DEFAULT_CACHE_SIZE = 128
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def fingerprint(schema: Optional[dict | bool], extended_formats: Optional[list] = None) -> Optional[Hashable]:
+    """
+    Returns a key that is equal for equal schemas with the same formatters, None if the schema or the formatters can
+    not be keyed. The order of the schema's keys is kept, since it changes the parser, e.g. the first matching
+    "patternProperties" pattern is used and "properties" are the fields of records in order.
+
+    :param schema: the schema
+    :param extended_formats: the formatter classes or instances added to the default ones
+    """
+    try:
+        formats = tuple(extended_formats or ())
+        hash(formats)
+        return json.dumps(schema, separators=(',', ':')), formats
+    except (TypeError, ValueError):
+        return None
+
+
+class LRUCache:
+    """
+    A thread safe LRU cache, e.g. of compiled parsers. When it is full, the least recently used value is dropped.
+    The cached values are not pickled, an unpickled cache is empty.
+
+    :param maxsize: the maximal number of values in the cache, 0 disables the cache
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 0:
+            raise ValueError('cache size can not be negative')
+
+        self._maxsize = maxsize
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._hits = self._misses = 0
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return type(self), (self._maxsize,)
+
+    def get(self, key: Optional[Hashable], build: Callable[[Any], Any]):
+        """
+        Returns the cached value of the key, or builds and caches it.
+
+        :param key: the key of the value, a None key is built and not cached
+        :param build: builds the value of the key on a miss
+        """
+        if key is not None:
+            with self._lock:
+                value = self._items.get(key, _MISSING)
+                if value is not _MISSING:
+                    self._items.move_to_end(key)
+                    self._hits += 1
+                    return value
+
+                self._misses += 1
+
+        # built outside the lock, so a slow build does not block the other keys
+        value = build(key)
+        if key is not None and self._maxsize:
+            with self._lock:
+                self._items[key] = value
+                self._items.move_to_end(key)
+                while len(self._items) > self._maxsize:
+                    self._items.popitem(last=False)
+
+        return value
+
+    def resize(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError('cache size can not be negative')
+
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._items) > maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._hits = self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._items))
@@ -0,0 +1,26 @@
+from typing import Hashable
+
+_BOOLEAN, _ARRAY, _OBJECT = 'boolean', 'array', 'object'
+
+
+def canonical(value) -> Hashable:
+    """
+    Returns a hashable key of a json value, the keys of two values are equal exactly when the values are equal in json
+    schema: numbers are equal by their value (1 and 1.0), booleans are not numbers (1 and true), arrays are equal by
+    their items in order, and objects by their properties in any order.
+
+    :param value: a json value (list, dict, str, int, float, bool or None)
+    """
+    if type(value) in (str, int, float) or value is None:
+        return value
+
+    if value is True or value is False:
+        return _BOOLEAN, value
+
+    if isinstance(value, dict):
+        return _OBJECT, frozenset((key, canonical(item)) for key, item in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return _ARRAY, tuple(map(canonical, value))
+
+    return value
@@ -0,0 +1,365 @@
+import math
+from typing import Any, Callable, Optional
+
+from pyjschema.array import ArrayNode
+from pyjschema.canonical import canonical
+from pyjschema.node import Node, AnyNode, NeverNode, UnsupportedNode, ConstNode, EnumNode, BooleanNode, NullNode, \
+    CompositionNode, is_picking, parse_picking
+from pyjschema.number import NumberNode
+from pyjschema.object import ObjectNode
+from pyjschema.record import RecordObjectNode
+from pyjschema.string import StringNode
+
+_MISSING = object()
+_INDENT = '    '
+
+
+class GeneratedParser:
+    """
+    The result of the code generation, the generated source and the function that was executed from it.
+    """
+
+    def __init__(self, source: str, function: Callable[[Any], Any]):
+        self.source = source
+        self.function = function
+
+
+def generate(node: Node) -> GeneratedParser:
+    """
+    Generates python source code for parsing according to a compiled schema and executes it.
+
+    :param node: the root node of the compiled schema
+    """
+    generator = CodeGenerator()
+    name = generator.function(node)
+    source = generator.source(entry=name)
+
+    namespace = dict(generator.namespace)
+    exec(compile(source, '<pyjschema>', 'exec'), namespace)
+    return GeneratedParser(source, namespace['parse'])
+
+
+class CodeGenerator:
+    """
+    Turns compiled nodes into python source code: type checks are inlined, "properties" are unrolled, bounds become
+    constants and formats are decoded by a direct call to the formatter. Every object, array and composition node gets
+    its own function, so recursive schemas become recursive functions.
+    """
+
+    def __init__(self):
+        self.namespace: dict[str, Any] = {'MISSING': _MISSING}
+        self._functions: dict[int, str] = {}
+        self._blocks: list[list[str]] = []
+        self._tuples: list[str] = []
+
+    def source(self, entry: str) -> str:
+        lines = [line for block in self._blocks for line in block + ['']]
+        lines += [''] + self._tuples + [f'parse = {entry}', '']
+        return '\n'.join(lines)
+
+    def functions(self, nodes: list[Node]) -> str:
+        """
+        Generates functions for the nodes and returns the name of a tuple holding them.
+        """
+        # the nested functions add their own tuples, so the name is taken after they are generated
+        names = [self.function(node) for node in nodes]
+        name = f'functions_{len(self._tuples)}'
+        self._tuples.append(f'{name} = ({", ".join(names)},)')
+        return name
+
+    def is_valid(self, node: Node) -> str:
+        """
+        Returns the name of the node's exception free validity check.
+        """
+        return self.constant(node.is_valid, 'v')
+
+    def validate(self, node: Node) -> str:
+        """
+        Returns the name of the node's validation, for sub schemas whose parsed result is not used.
+        """
+        return self.constant(node.validate, 'v')
+
+    def constant(self, value, prefix: str = 'c') -> str:
+        name = f'{prefix}{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def literal(self, value) -> str:
+        if type(value) in (int, str) or (type(value) is float and math.isfinite(value)):
+            return repr(value)
+
+        return self.constant(value)
+
+    def function(self, node: Node) -> str:
+        """
+        Generates a function parsing according to the node (once per node) and returns its name.
+        """
+        if id(node) in self._functions:
+            return self._functions[id(node)]
+
+        name = self._functions[id(node)] = f'parse_{len(self._functions)}'
+
+        match node:
+            case ObjectNode():
+                body = self._object(node)
+            case ArrayNode():
+                body = self._array(node)
+            case CompositionNode():
+                body = self._composition(node)
+            case _:
+                lines, expr = self.inline(node, 'obj')
+                body = lines + [f'return {expr or "obj"}']
+
+        self._blocks.append([f'def {name}(obj):'] + _indent(body))
+        return name
+
+    def inline(self, node: Node, var: str) -> tuple[list[str], Optional[str]]:
+        """
+        Generates statements parsing the value in the variable `var` according to the node.
+
+        :return: the statements and an expression of the result, None if the result is the value itself
+        """
+        match node:
+            case AnyNode():
+                return [], None
+            case NeverNode() | UnsupportedNode():
+                return [_raise(_message(node))], None
+            case ConstNode():
+                return [f'if {self._canonical(node.const, var)} != {self.literal(node.key)}:',
+                        _INDENT + _raise(f'value should be: {node.const}')], None
+            case EnumNode():
+                lines, expr = self.inline(node.node, var)
+                return [f'if {self.constant(canonical, "k")}({var}) not in {self.constant(node.keys, "e")}:',
+                        _INDENT + _raise('value is not one of the "enum" values')] + lines, expr
+            case BooleanNode():
+                return [f'if not isinstance({var}, bool):', _INDENT + _raise('value is not a boolean')], None
+            case NullNode():
+                return [f'if {var} is not None:', _INDENT + _raise('value is not null')], None
+            case NumberNode():
+                return self._number(node, var), None
+            case StringNode():
+                return self._string(node, var)
+            case ObjectNode() | ArrayNode() | CompositionNode():
+                return [], f'{self.function(node)}({var})'
+            case _:
+                return [], f'{self.constant(node.parse, "n")}({var})'
+
+    def _canonical(self, const, var: str) -> str:
+        # a string or null is only equal to itself, for other values the canonical keys are compared
+        if type(const) is str or const is None:
+            return var
+
+        return f'{self.constant(canonical, "k")}({var})'
+
+    def _number(self, node: NumberNode, var: str) -> list[str]:
+        lines = [f'if not isinstance({var}, (float, int)):', _INDENT + _raise('value is not a number')]
+
+        for value, op, message in (
+                (node.minimum, '<', f'value is less then {node.minimum}'),
+                (node.exclusive_minimum, '<=', f'value is less or equal then {node.exclusive_minimum}'),
+                (node.maximum, '>', f'value is more then {node.maximum}'),
+                (node.exclusive_maximum, '>=', f'value is more or equal then {node.exclusive_maximum}')):
+            if value is not None:
+                lines += [f'if {var} {op} {self.literal(value)}:', _INDENT + _raise(message)]
+
+        if node.multiple_of is not None:
+            lines += [f'if not ({var} / {self.literal(node.multiple_of)}).is_integer():',
+                      _INDENT + _raise(f'value is not a multiply {node.multiple_of}')]
+
+        return lines
+
+    def _string(self, node: StringNode, var: str) -> tuple[list[str], Optional[str]]:
+        lines = [f'if not isinstance({var}, str):', _INDENT + _raise('value is not a string')]
+
+        # the keywords' values are emitted through literal(), they are not trusted to be numbers
+        if node.min_length is not None:
+            message = f'min length should be {node.min_length}, got '
+            lines += [f'if len({var}) < {self.literal(node.min_length)}:',
+                      _INDENT + f'raise ValueError({message!r} + str(len({var})))']
+
+        if node.max_length is not None:
+            message = f'max length should be {node.max_length}, got '
+            lines += [f'if len({var}) > {self.literal(node.max_length)}:',
+                      _INDENT + f'raise ValueError({message!r} + str(len({var})))']
+
+        if node.pattern is not None:
+            pattern = self.constant(node.pattern, 'p')
+            lines += [f'if {pattern}.fullmatch({var}) is None:',
+                      _INDENT + _raise('value does not comply with the pattern')]
+
+        if node.format is None:
+            return lines, None
+
+        prefix = f'error in formatting data, format: {node.format}, error: '
+        if node.formatter is None:
+            return lines + [_raise(prefix + f'format {node.format} is not supported')], None
+
+        decode = self.constant(node.formatter.cached_decode, 'f')
+        result = f'{var}_'
+        lines += ['try:',
+                  _INDENT + f'{result} = {decode}({var})',
+                  'except Exception as e:',
+                  _INDENT + f'raise ValueError({prefix!r} + str(e))']
+        return lines, result
+
+    def _object(self, node: ObjectNode) -> list[str]:
+        lines = ['if not isinstance(obj, dict):', _INDENT + _raise('value is not a dict')]
+
+        if node.min_properties is not None:
+            lines += [f'if len(obj) < {self.literal(node.min_properties)}:',
+                      _INDENT + _raise(f'object should be longer then {node.min_properties} items')]
+
+        if node.max_properties is not None:
+            lines += [f'if len(obj) > {self.literal(node.max_properties)}:',
+                      _INDENT + _raise(f'object should be shorter then {node.max_properties} items')]
+
+        for key in node.required:
+            lines += [f'if {key!r} not in obj:', _INDENT + _raise(f'filed "{key}" is required')]
+
+        for dependent, dependencies in node.dependent_required.items():
+            for dependency in dependencies:
+                lines += [f'if {dependent!r} in obj and {dependency!r} not in obj:',
+                          _INDENT + _raise(f'"{dependent}" in dependent in "{dependency}"')]
+
+        for dependent, sub_node in node.dependent_schemas.items():
+            lines += [f'if {dependent!r} in obj:', _INDENT + f'{self.validate(sub_node)}(obj[{dependent!r}])']
+
+        if node.if_ is not None:
+            lines += [f'if {self.is_valid(node.if_)}(obj):',
+                      _INDENT + (f'{self.validate(node.then)}(obj)' if node.then is not None else 'pass')]
+            if node.else_ is not None:
+                lines += ['else:', _INDENT + f'{self.validate(node.else_)}(obj)']
+
+        lines += ['ret = dict(obj)']
+        for key, sub_node in node.properties.items():
+            value_lines, expr = self.inline(sub_node, 'v')
+            if not value_lines and expr is None:
+                continue
+
+            lines += [f'v = obj.get({key!r}, MISSING)', 'if v is not MISSING:']
+            lines += _indent(value_lines + ([f'ret[{key!r}] = {expr}'] if expr is not None else []))
+
+        if node.pattern_properties or node.no_additional_properties or node.additional_properties is not None:
+            lines += ['for key, v in obj.items():', _INDENT + f'if key in {self.constant(frozenset(node.properties))}:',
+                      _INDENT * 2 + 'continue']
+            lines += _indent(self._additional_properties(node))
+
+        if isinstance(node, RecordObjectNode):
+            return lines + [f'return {self.constant(node.record_type.from_dict, "r")}(ret)']
+
+        return lines + ['return ret']
+
+    def _additional_properties(self, node: ObjectNode) -> list[str]:
+        lines = []
+        if node.patterns_regex is not None:
+            lines += [f'match = {self.constant(node.patterns_regex, "p")}.match(key)', 'if match is not None:',
+                      _INDENT + 'group = match.lastgroup']
+            for i, (_, sub_node) in enumerate(node.pattern_properties):
+                value_lines, expr = self.inline(sub_node, 'v')
+                body = value_lines + ([f'ret[key] = {expr}'] if expr is not None else [])
+                lines += _indent([f'{"if" if i == 0 else "elif"} group == "p{i}":'] + _indent(body or ['pass']))
+            lines += [_INDENT + 'continue']
+
+        for pattern, sub_node in node.pattern_properties if node.patterns_regex is None else []:
+            lines += [f'if {self.constant(pattern, "p")}.search(key):']
+            value_lines, expr = self.inline(sub_node, 'v')
+            lines += _indent(value_lines + ([f'ret[key] = {expr}'] if expr is not None else []) + ['continue'])
+
+        if node.no_additional_properties:
+            lines += [_raise('additional properties are not allowed')]
+        elif node.additional_properties is not None:
+            value_lines, expr = self.inline(node.additional_properties, 'v')
+            lines += value_lines + ([f'ret[key] = {expr}'] if expr is not None else [])
+
+        return lines or ['pass']
+
+    def _array(self, node: ArrayNode) -> list[str]:
+        lines = ['if not isinstance(obj, list):', _INDENT + _raise('value is not an array')]
+
+        if node.min_items is not None:
+            lines += [f'if len(obj) < {self.literal(node.min_items)}:',
+                      _INDENT + _raise('array length does not match "minItems"')]
+
+        if node.max_items is not None:
+            lines += [f'if len(obj) > {self.literal(node.max_items)}:',
+                      _INDENT + _raise('array length does not match "maxItems"')]
+
+        if node.unique_items:
+            lines += ['unique_check = set()']
+
+        if node.contains is not None:
+            lines += ['contains_count = 0']
+
+        lines += ['ret = []', 'append = ret.append']
+        loop = []
+        if node.unique_items:
+            loop += [f'key = {self.constant(canonical, "k")}(v)',
+                     'if key in unique_check:', _INDENT + _raise('array values are not unique'),
+                     'unique_check.add(key)']
+
+        if node.contains is not None:
+            loop += [f'if {self.is_valid(node.contains)}(v):', _INDENT + 'contains_count += 1']
+
+        if node.prefix_items is not None:
+            prefix_items = self.functions(node.prefix_items)
+            loop += [f'if i < {len(node.prefix_items)}:', _INDENT + f'append({prefix_items}[i](v))',
+                     _INDENT + 'continue']
+
+        if node.items is not None:
+            value_lines, expr = self.inline(node.items, 'v')
+            loop += value_lines + [f'append({expr or "v"})']
+        else:
+            loop += ['append(v)']
+
+        lines += [f'for {"i, v in enumerate(obj)" if node.prefix_items is not None else "v in obj"}:'] + _indent(loop)
+
+        if node.contains is not None:
+            max_check = f' or contains_count > {self.literal(node.max_contains)}' \
+                if node.max_contains is not None else ''
+            lines += [f'if contains_count < {self.literal(node.min_contains)}{max_check}:',
+                      _INDENT + _raise('value does not comply with the "contains" rules')]
+
+        return lines + ['return ret']
+
+    def _composition(self, node: CompositionNode) -> list[str]:
+        lines = ['ret = obj']
+
+        # the picks of the nested compositions are kept from the outermost one
+        if node.any_of is not None or node.one_of is not None:
+            lines = [f'if not {self.constant(is_picking, "m")}():',
+                     _INDENT + f'return {self.constant(parse_picking, "m")}({self._functions[id(node)]}, obj)'] + lines
+
+        if node.not_ is not None:
+            lines += [f'if {self.is_valid(node.not_)}(obj):', _INDENT + _raise('should not match the schema')]
+
+        for sub_node in node.all_of or []:
+            lines += [f'ret = {self.function(sub_node)}(obj)']
+
+        # only the picked sub schemas are parsed, the rest are only checked
+        if node.any_of is not None or node.one_of is not None:
+            lines += [f'any_of, one_of = {self.constant(node.pick, "p")}(obj)']
+
+        if node.any_of is not None:
+            lines += ['if any_of is None:', _INDENT + _raise('not passed any of the "anyOf" options'),
+                      f'ret = {self.functions(node.any_of)}[any_of](obj)']
+
+        if node.one_of is not None:
+            lines += ['if one_of is None:', _INDENT + _raise('should apply only to one of the schemas'),
+                      f'ret = {self.functions(node.one_of)}[one_of](obj)']
+
+        return lines + ['return ret']
+
+
+def _message(node: Node) -> str:
+    if isinstance(node, NeverNode):
+        return node.message
+
+    return f'type {node.type} is not supported'
+
+
+def _raise(message: str) -> str:
+    return f'raise ValueError({message!r})'
+
+
+def _indent(lines: list[str]) -> list[str]:
+    return [_INDENT + line for line in lines]
@@ -0,0 +1,156 @@
+from typing import Optional
+
+from pyjschema.array import ArrayNode
+from pyjschema.discriminator import Discriminator
+from pyjschema.lazy import LAZY_NODES
+from pyjschema.node import Node, AnyNode, NeverNode, UnsupportedNode, ConstNode, EnumNode, BooleanNode, NullNode, \
+    CompositionNode
+from pyjschema.number import NumberNode
+from pyjschema.object import ObjectNode
+from pyjschema.record import RECORD_NODES
+from pyjschema.refs import RefResolver
+from pyjschema.string import StringNode, Formatter
+
+_COMPOSITION_KEYWORDS = ('allOf', 'anyOf', 'oneOf', 'not')
+
+
+class SchemaCompiler:
+    """
+    Compiles a json schema into a tree of nodes once, so the schema is not interpreted again for every document.
+
+    Every schema is compiled once: a "$ref" is linked directly to the node of the schema it points to, and recursive
+    schemas become cycles in the tree.
+
+    In lazy mode, objects and arrays are parsed to read only views whose formatted values are decoded when first read.
+    In records mode, objects are parsed to records with slots per object schema.
+    """
+
+    def __init__(self, root: Optional[dict | bool], formats: dict[str, Formatter], lazy: bool = False,
+                 records: bool = False):
+        self._formats = formats
+        self._lazy = lazy
+        self._records = records
+        self._resolver = RefResolver(root)
+        # the compiled schema is held with its node, so its id is not reused while compiling
+        self._nodes: dict[int, tuple[dict, Optional[Node]]] = {}
+
+    def compile(self, schema: Optional[dict | bool]) -> Node:
+        """
+        Compiles a schema into a node.
+
+        :param schema: the schema to compile, a part of the root schema
+        """
+        if schema is None or schema is True:
+            return AnyNode()
+
+        if schema is False:
+            return NeverNode()
+
+        if id(schema) in self._nodes:
+            node = self._nodes[id(schema)][1]
+            if node is None:
+                raise ValueError(f'ref "{schema["$ref"]}" is circular')
+
+            return node
+
+        if '$ref' in schema:
+            self._nodes[id(schema)] = (schema, None)
+            node = self.compile(self._resolver.resolve(schema['$ref'], self._resolver.base_uri(schema)))
+            self._nodes[id(schema)] = (schema, node)
+            return node
+
+        # the node is registered before its sub schemas are compiled, so a recursive "$ref" links back to it
+        node_type = self._node_type(schema)
+        if self._lazy:
+            node_type = LAZY_NODES.get(node_type, node_type)
+        if self._records:
+            node_type = RECORD_NODES.get(node_type, node_type)
+
+        node = node_type.__new__(node_type)
+        self._nodes[id(schema)] = (schema, node)
+
+        match node:
+            case CompositionNode():
+                self._init_composition(node, schema)
+            case ObjectNode() | ArrayNode():
+                node.__init__(schema, self.compile)
+            case StringNode():
+                node.__init__(schema, self._formats)
+            case NumberNode():
+                node.__init__(schema)
+            case ConstNode():
+                node.__init__(schema['const'])
+            case EnumNode():
+                rest = {key: value for key, value in schema.items() if key != 'enum'}
+                self._resolver.inherit(rest, schema)
+                node.__init__(schema['enum'], self.compile(rest))
+            case UnsupportedNode():
+                node.__init__(schema['type'])
+            case _:
+                node.__init__()
+
+        return node
+
+    @staticmethod
+    def _node_type(schema: dict) -> type[Node]:
+        if any(schema.get(keyword) for keyword in _COMPOSITION_KEYWORDS):
+            return CompositionNode
+
+        if 'const' in schema:
+            return ConstNode
+
+        if 'enum' in schema:
+            return EnumNode
+
+        match schema.get('type'):
+            case None:
+                return AnyNode
+
+            case 'object':
+                return ObjectNode
+
+            case 'array':
+                return ArrayNode
+
+            case 'string':
+                return StringNode
+
+            case 'number' | 'integer':
+                return NumberNode
+
+            case 'boolean':
+                return BooleanNode
+
+            case 'null':
+                return NullNode
+
+            case _:
+                return UnsupportedNode
+
+    def _init_composition(self, node: CompositionNode, schema: dict):
+        rest = {key: value for key, value in schema.items() if key not in _COMPOSITION_KEYWORDS}
+        all_of, any_of, one_of, not_ = (schema.get(keyword) for keyword in _COMPOSITION_KEYWORDS)
+
+        # sub schemas are evaluated from the last to the first, e.g. the result of the first "allOf" one is returned
+        any_of = self._compile_merged(rest, any_of[::-1]) if any_of is not None else None
+        one_of = self._compile_merged(rest, one_of[::-1]) if one_of is not None else None
+        node.__init__(
+            all_of=self._compile_merged(rest, all_of[::-1]) if all_of is not None else None,
+            any_of=any_of,
+            one_of=one_of,
+            not_=self._compile_merged(rest, [not_])[0] if not_ is not None else None,
+            any_of_discriminator=Discriminator.find(any_of) if any_of is not None else None,
+            one_of_discriminator=Discriminator.find(one_of) if one_of is not None else None,
+        )
+
+    def _compile_merged(self, schema: dict, sub_schemas: list[dict]) -> list[Node]:
+        nodes = []
+        for sub_schema in sub_schemas:
+            if isinstance(sub_schema, dict):
+                merged = {**schema, **sub_schema}
+                self._resolver.inherit(merged, sub_schema)
+                sub_schema = merged
+
+            nodes.append(self.compile(sub_schema))
+
+        return nodes
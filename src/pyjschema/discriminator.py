@@ -0,0 +1,77 @@
+from collections import Counter
+from typing import Any, Optional
+
+from pyjschema.canonical import canonical
+from pyjschema.node import Node, ConstNode, EnumNode
+from pyjschema.object import ObjectNode
+
+
+class Discriminator:
+    """
+    Indexes the sub schemas of "anyOf" or "oneOf" by a tag: a property that the sub schemas require with a "const" or
+    "enum" value (a tagged union). An object can only match the sub schemas of its tag and the untagged sub schemas, so only
+    they are checked, whatever the number of sub schemas is.
+
+    :param key: the tag property
+    :param tags: the tags of every sub schema by their properties, sub schemas without the key are untagged
+    """
+
+    def __init__(self, key: str, tags: list[dict[str, frozenset]]):
+        self.key = key
+        self.all = tuple(range(len(tags)))
+        self.untagged = tuple(i for i, node_tags in enumerate(tags) if key not in node_tags)
+
+        # the indices stay in the order of the sub schemas, so the same one is picked as without the index
+        table: dict[Any, set[int]] = {}
+        for i, node_tags in enumerate(tags):
+            for tag in node_tags.get(key, ()):
+                table.setdefault(tag, set()).add(i)
+        self.table: dict[Any, tuple[int, ...]] = {tag: tuple(sorted(indices | set(self.untagged)))
+                                                  for tag, indices in table.items()}
+
+    @classmethod
+    def find(cls, nodes: list[Node]) -> Optional['Discriminator']:
+        """
+        Returns a discriminator of the most tagged property, None if less than two sub schemas are tagged.
+
+        :param nodes: the compiled sub schemas
+        """
+        tags = [_tags(node) for node in nodes]
+        counts = Counter(key for node_tags in tags for key in node_tags)
+        if not counts:
+            return None
+
+        key, count = counts.most_common(1)[0]
+        if count < 2:
+            return None
+
+        return cls(key, tags)
+
+    def indices(self, obj) -> tuple[int, ...]:
+        """
+        Returns the indices of the sub schemas the object can match, in their order.
+        """
+        if not isinstance(obj, dict) or self.key not in obj:
+            return self.untagged
+
+        try:
+            return self.table.get(canonical(obj[self.key]), self.untagged)
+        except TypeError:
+            # not a json value
+            return self.all
+
+
+def _tags(node: Node) -> dict[str, frozenset]:
+    # a sub schema that is still compiled (a recursive one) is not tagged
+    if not isinstance(node, ObjectNode) or not hasattr(node, 'properties'):
+        return {}
+
+    tags = {}
+    for key in node.required:
+        value_node = node.properties.get(key)
+        if isinstance(value_node, ConstNode):
+            tags[key] = frozenset((value_node.key,))
+        elif isinstance(value_node, EnumNode):
+            tags[key] = value_node.keys
+
+    return tags
@@ -1,13 +1,65 @@
 import base64
 import json
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, IO, Iterator
 
 import uuid
 
+from pyjschema.load import get_parser
+from pyjschema.stream import iter_chunks, write_chunks, DEFAULT_CHUNK_SIZE
 
-def dumps(obj, schema: Optional[dict] = None, **kwargs) -> str:
-    return json.dumps(obj, default=_encoder, **kwargs)
+
+def dumps(obj, schema: Optional[dict] = None, validate: bool = False, extended_formats: Optional[list] = None,
+          **kwargs) -> str:
+    """
+    Like json.dumps(), only that if a schema is given, the values are encoded according to the schema (with the
+    formatter of each field), see JsonSchemaParser.dumps().
+
+    :param obj: the object to encode
+    :param schema: the schema to encode according to
+    :param validate: if True, the encoded object is validated according to the schema
+    :param extended_formats: more formats for string encoding
+    :param kwargs: stdlib json additional parameters
+    """
+    if schema is None:
+        return json.dumps(obj, default=_encoder, **kwargs)
+
+    parser = get_parser(schema, extended_formats=extended_formats)
+    return parser.dumps(obj, validate=validate, **kwargs)
+
+
+def iter_dumps(obj, schema: Optional[dict] = None, extended_formats: Optional[list] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs) -> Iterator[str]:
+    """
+    Like dumps(), only that the json text is yielded in chunks while it is encoded, see JsonSchemaParser.iter_dumps().
+
+    :param obj: the object to encode
+    :param schema: the schema to encode according to
+    :param extended_formats: more formats for string encoding
+    :param chunk_size: the minimal size of each chunk
+    :param kwargs: stdlib json.JSONEncoder parameters
+    """
+    if schema is None:
+        return iter_chunks(json.JSONEncoder(default=_encoder, **kwargs).iterencode(obj), chunk_size)
+
+    parser = get_parser(schema, extended_formats=extended_formats)
+    return parser.iter_dumps(obj, chunk_size=chunk_size, **kwargs)
+
+
+def dump(obj, fp: IO, schema: Optional[dict] = None, extended_formats: Optional[list] = None,
+         chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs):
+    """
+    Like json.dump(), only that the values are encoded according to the schema (see dumps()), and the json is written
+    in chunks while it is encoded.
+
+    :param obj: the object to encode
+    :param fp: a text or binary stream to write to, binary streams get utf-8
+    :param schema: the schema to encode according to
+    :param extended_formats: more formats for string encoding
+    :param chunk_size: the minimal size of each write
+    :param kwargs: stdlib json.JSONEncoder parameters
+    """
+    write_chunks(iter_dumps(obj, schema, extended_formats=extended_formats, chunk_size=chunk_size, **kwargs), fp)
 
 
 def _encoder(obj):
@@ -24,4 +76,4 @@ def _encoder(obj):
     elif isinstance(obj, bytes):
         return base64.b64encode(obj).decode()
 
-    return json.dumps(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
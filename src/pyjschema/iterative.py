@@ -0,0 +1,252 @@
+from typing import Any, Callable, Generator
+
+from pyjschema.array import ArrayNode
+from pyjschema.canonical import canonical
+from pyjschema.node import Node, CompositionNode, EnumNode
+from pyjschema.object import ObjectNode
+from pyjschema.record import RecordObjectNode
+
+DEFAULT_MAX_DEPTH = 10000
+
+# a task parses the value of a node that holds other nodes. It yields the tasks of the nested values and is sent their
+# results (or thrown their errors), so the nesting of the document is held in the work stack and not in python frames.
+# A validating task only checks the value, it builds no result and returns None
+Task = Generator['Task', Any, Any]
+
+
+def parse_iterative(node: Node, obj, max_depth: int = DEFAULT_MAX_DEPTH):
+    """
+    Parses the object according to the node like node.parse(), with an explicit work stack instead of a python call
+    for every level, so documents of any nesting depth (up to max_depth) do not reach the recursion limit.
+
+    Objects, arrays, compositions and enums are evaluated on the stack, the rest of the nodes are parsed as they are.
+
+    :param node: the compiled schema
+    :param obj: the object to parse
+    :param max_depth: the maximal depth of the work stack, the levels of the document and of the "allOf", "anyOf",
+        "oneOf" and "not" keywords in it
+    """
+    return _run(node, obj, max_depth, validating=False)
+
+
+def validate_iterative(node: Node, obj, max_depth: int = DEFAULT_MAX_DEPTH):
+    """
+    Validates the object according to the node like node.validate(), with the work stack of parse_iterative(). No
+    result is built and formats are only checked, not decoded.
+
+    :param node: the compiled schema
+    :param obj: the object to validate
+    :param max_depth: the maximal depth of the work stack
+    """
+    _run(node, obj, max_depth, validating=True)
+
+
+def _run(node: Node, obj, max_depth: int, validating: bool):
+    task = _TASKS.get(type(node))
+    if task is None:
+        return _leaf(node, obj, validating)
+
+    stack: list[Task] = [task(node, obj, validating)]
+    value, error = None, None
+    while stack:
+        try:
+            if error is None:
+                request = stack[-1].send(value)
+            else:
+                thrown, error = error, None
+                request = stack[-1].throw(thrown)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        except ValueError as e:
+            stack.pop()
+            error = e
+            continue
+
+        if len(stack) >= max_depth:
+            raise ValueError(f'value is nested deeper than {max_depth} levels')
+
+        stack.append(request)
+        value = None
+
+    if error is not None:
+        raise error
+
+    return value
+
+
+def _leaf(node: Node, obj, validating: bool):
+    if validating:
+        node.validate(obj)
+        return None
+
+    return node.parse(obj)
+
+
+def _parse(node: Node, obj, validating: bool) -> Task:
+    task = _TASKS.get(type(node))
+    if task is None:
+        return _leaf(node, obj, validating)
+
+    return (yield task(node, obj, validating))
+
+
+def _is_valid(node: Node, obj) -> Task:
+    task = _TASKS.get(type(node))
+    if task is None:
+        return node.is_valid(obj)
+
+    try:
+        yield task(node, obj, True)
+    except ValueError:
+        return False
+
+    return True
+
+
+def _object_task(node: ObjectNode, obj, validating: bool) -> Task:
+    if not isinstance(obj, dict):
+        raise ValueError('value is not a dict')
+
+    node._validate_object_size(obj)
+
+    for key in node.required:
+        if key not in obj:
+            raise ValueError(f'filed "{key}" is required')
+
+    for dependent, dependencies in node.dependent_required.items():
+        for dependency in dependencies:
+            if dependent in obj and dependency not in obj:
+                raise ValueError(f'"{dependent}" in dependent in "{dependency}"')
+
+    for dependent, sub_node in node.dependent_schemas.items():
+        if dependent in obj:
+            yield from _parse(sub_node, obj[dependent], True)
+
+    if node.if_ is not None:
+        sub_node = node.then if (yield from _is_valid(node.if_, obj)) else node.else_
+        if sub_node is not None:
+            yield from _parse(sub_node, obj, True)
+
+    ret = None if validating else dict()
+    properties = node.properties
+    for key, value in obj.items():
+        sub_node = properties.get(key)
+        if sub_node is None:
+            sub_node = node.match_pattern(key)
+
+        if sub_node is None:
+            if node.no_additional_properties:
+                raise ValueError(f'additional properties are not allowed')
+
+            sub_node = node.additional_properties
+            if sub_node is None:
+                if not validating:
+                    ret[key] = value
+                continue
+
+        # the values of the rest of the nodes are parsed right away, without a task
+        task = _TASKS.get(type(sub_node))
+        value = _leaf(sub_node, value, validating) if task is None else (yield task(sub_node, value, validating))
+        if not validating:
+            ret[key] = value
+
+    return ret
+
+
+def _record_task(node: RecordObjectNode, obj, validating: bool) -> Task:
+    ret = yield from _object_task(node, obj, validating)
+    return None if validating else node.record_type.from_dict(ret)
+
+
+def _array_task(node: ArrayNode, obj, validating: bool) -> Task:
+    if not isinstance(obj, list):
+        raise ValueError('value is not an array')
+
+    node._validate_array_range(obj)
+
+    prefix_items = node.prefix_items or ()
+    contains_count = 0
+    ret, unique_check = None if validating else [], set()
+    for i, item in enumerate(obj):
+        if node.unique_items:
+            key = canonical(item)
+            if key in unique_check:
+                raise ValueError('array values are not unique')
+            unique_check.add(key)
+
+        if node.contains is not None and (yield from _is_valid(node.contains, item)):
+            contains_count += 1
+
+        sub_node = prefix_items[i] if i < len(prefix_items) else node.items
+        if sub_node is None:
+            if not validating:
+                ret.append(item)
+            continue
+
+        task = _TASKS.get(type(sub_node))
+        item = _leaf(sub_node, item, validating) if task is None else (yield task(sub_node, item, validating))
+        if not validating:
+            ret.append(item)
+
+    if node.contains is not None and \
+            (contains_count < node.min_contains or
+             (node.max_contains is not None and contains_count > node.max_contains)):
+        raise ValueError('value does not comply with the "contains" rules')
+
+    return ret
+
+
+def _composition_task(node: CompositionNode, obj, validating: bool) -> Task:
+    ret = None if validating else obj
+
+    if node.not_ is not None and (yield from _is_valid(node.not_, obj)):
+        raise ValueError('should not match the schema')
+
+    if node.all_of is not None:
+        for sub_node in node.all_of:
+            ret = yield from _parse(sub_node, obj, validating)
+
+    # a sub schema is valid exactly when it is parsed, so each one is parsed once and not checked first
+    if node.any_of is not None:
+        for i in node._candidates(node.any_of, node.any_of_discriminator, obj):
+            try:
+                ret = yield from _parse(node.any_of[i], obj, validating)
+            except ValueError:
+                continue
+
+            break
+        else:
+            raise ValueError('not passed any of the "anyOf" options')
+
+    if node.one_of is not None:
+        passed = []
+        for i in node._candidates(node.one_of, node.one_of_discriminator, obj):
+            try:
+                passed.append((yield from _parse(node.one_of[i], obj, validating)))
+            except ValueError:
+                pass
+
+        if len(passed) != 1:
+            raise ValueError('should apply only to one of the schemas')
+
+        ret = passed[0]
+
+    return ret
+
+
+def _enum_task(node: EnumNode, obj, validating: bool) -> Task:
+    if canonical(obj) not in node.keys:
+        raise ValueError('value is not one of the "enum" values')
+
+    return (yield from _parse(node.node, obj, validating))
+
+
+_TASKS: dict[type[Node], Callable[[Any, Any, bool], Task]] = {
+    ObjectNode: _object_task,
+    RecordObjectNode: _record_task,
+    ArrayNode: _array_task,
+    CompositionNode: _composition_task,
+    EnumNode: _enum_task,
+}
@@ -0,0 +1,127 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Iterator
+
+from pyjschema.array import ArrayNode
+from pyjschema.object import ObjectNode
+from pyjschema.string import StringNode
+
+
+class Deferred:
+    """
+    A formatted string whose decoding is deferred until it is first read.
+    """
+    __slots__ = ('decode', 'raw')
+
+    def __init__(self, decode: Callable[[str], Any], raw: str):
+        self.decode = decode
+        self.raw = raw
+
+    def resolve(self):
+        try:
+            return self.decode(self.raw)
+        except Exception as e:
+            raise ValueError(f'error in formatting data, error: {e}')
+
+
+def materialize(value):
+    """
+    Returns the decoded value of a deferred value, or the value itself for any other value.
+    """
+    return value.resolve() if isinstance(value, Deferred) else value
+
+
+class LazyDict(Mapping):
+    """
+    A read only view of a parsed object, its formatted values are decoded the first time they are read.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if isinstance(value, Deferred):
+            value = self._data[key] = value.resolve()
+
+        return value
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
+
+
+class LazyList(Sequence):
+    """
+    A read only view of a parsed array, its formatted items are decoded the first time they are read.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data: list):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._data)))]
+
+        value = self._data[index]
+        if isinstance(value, Deferred):
+            value = self._data[index] = value.resolve()
+
+        return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, tuple, Sequence)) or isinstance(other, (str, bytes)):
+            return NotImplemented
+
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self)!r})'
+
+
+class LazyStringNode(StringNode):
+    """
+    Checks the format of the string with the formatter's (cheaper) validity check, and defers the decoding. Formats
+    that are checked by decoding them are decoded right away, not to decode them twice.
+    """
+
+    def parse(self, obj):
+        if self.format is None or self.formatter is None or not self.formatter.checks_without_decoding or \
+                not self.is_valid(obj):
+            return super().parse(obj)
+
+        return Deferred(self.formatter.cached_decode, obj)
+
+
+class LazyObjectNode(ObjectNode):
+
+    def parse(self, obj):
+        return LazyDict(super().parse(obj))
+
+
+class LazyArrayNode(ArrayNode):
+
+    def parse(self, obj):
+        return LazyList(super().parse(obj))
+
+    def iter_parse(self, items):
+        return map(materialize, super().iter_parse(items))
+
+
+LAZY_NODES = {
+    StringNode: LazyStringNode,
+    ObjectNode: LazyObjectNode,
+    ArrayNode: LazyArrayNode,
+}
@@ -1,13 +1,38 @@
+import asyncio
+import copy
+import io
 import json
-import re
-from copy import deepcopy
-from typing import Optional, Type
-
-from pyjschema.number import validate_number
-from pyjschema.string import validate_string, Formatter, DEFAULT_FORMATS
-
-
-def loads(raw: str | bytes, schema: Optional[dict] = None, extended_formats: Optional[dict] = None, **kwargs):
+import os
+from functools import partial
+from concurrent.futures import Executor
+from typing import Optional, Type, Iterable, Collection, IO, Iterator, Sequence, AsyncIterable, AsyncIterator
+
+from pyjschema.codegen import generate
+from pyjschema.compiler import SchemaCompiler
+from pyjschema.iterative import parse_iterative, validate_iterative, DEFAULT_MAX_DEPTH
+from pyjschema.array import ArrayNode
+from pyjschema.backend import JsonBackend, get_backend
+from pyjschema.cache import LRUCache, CacheInfo, fingerprint
+from pyjschema.lazy import materialize
+from pyjschema.node import Node, AnyNode
+from pyjschema.object import ObjectNode
+from pyjschema.parallel import loads_parallel
+from pyjschema.stream import iter_lines, iter_array, iter_chunks, write_chunks, map_file, aiter_reader_lines, \
+    DEFAULT_CHUNK_SIZE
+from pyjschema.string import Formatter, DEFAULT_FORMATS
+
+# jsons that are at least this long are parsed in an executor by the async methods, not to block the event loop
+ASYNC_EXECUTOR_THRESHOLD = 1 << 16
+
+# the parsers of the module level functions
+_parsers = LRUCache()
+# the parser cache keys of the recently passed schema objects, so a schema object that is passed again is not
+# serialized again. The entries hold their schemas, so the ids are not reused by other objects
+_keys = LRUCache()
+
+
+def loads(raw: str | bytes | memoryview, schema: Optional[dict] = None, extended_formats: Optional[dict] = None,
+          **kwargs):
     """
     Like json.loads(), only that if a schema is given, it validates the data according to the schema and fills the
     fields in pythonic types according to the schema (for example datetime for type "string" and forma "date-time").
@@ -17,11 +42,12 @@ def loads(raw: str | bytes, schema: Optional[dict] = None, extended_formats: Opt
     :param raw: the json to parse according to the schema
     :param schema: the schema to check according to
     :param extended_formats: more formats for string parsing
-    :param kwargs: stdlib json additional parameters
+    :param kwargs: stdlib json additional parameters, the json is decoded by the default json backend (see
+        get_backend()) when there are none
 
     TODO: add the params options of json.loads to this function
     """
-    obj = json.loads(raw, **kwargs)
+    obj = json.loads(raw, **kwargs) if kwargs else get_backend().loads(raw)
     return loado(obj, schema, extended_formats=extended_formats)
 
 
@@ -29,282 +55,514 @@ def loado(obj, schema: Optional[dict] = None, extended_formats: Optional[dict] =
     if schema is None:
         return obj
 
-    parser = JsonSchemaParser(schema, extended_formats=extended_formats)
+    parser = get_parser(schema, extended_formats=extended_formats)
     return parser.parse(obj)
 
 
+def loads_many(raws: Iterable[str | bytes], schema: Optional[dict] = None, extended_formats: Optional[dict] = None,
+               raise_errors: bool = True) -> list:
+    """
+    Like loads() for many jsons, the schema is compiled once for all of them.
+
+    :param raws: the jsons to parse according to the schema
+    :param schema: the schema to check according to
+    :param extended_formats: more formats for string parsing
+    :param raise_errors: if False, an invalid json does not stop the batch and its error is returned in its place
+    """
+    parser = get_parser(schema, extended_formats=extended_formats)
+    return parser.loads_many(raws, raise_errors=raise_errors)
+
+
+def iter_load(fp: IO, schema: Optional[dict] = None, extended_formats: Optional[dict] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, raise_errors: bool = True, skip_invalid: bool = False) -> Iterator:
+    """
+    Parses a stream of json lines (NDJSON) according to a schema, yielding the records one at a time.
+    See JsonSchemaParser.iter_load().
+
+    :param fp: a text or binary stream of json lines
+    :param schema: the schema to check according to
+    :param extended_formats: more formats for string parsing
+    :param chunk_size: the size of each read from the stream
+    :param raise_errors: if False, an invalid line does not stop the stream and its error is yielded in its place
+    :param skip_invalid: if True, invalid lines are skipped
+    """
+    parser = get_parser(schema, extended_formats=extended_formats)
+    return parser.iter_load(fp, chunk_size=chunk_size, raise_errors=raise_errors, skip_invalid=skip_invalid)
+
+
+def iter_items(fp: IO, schema: Optional[dict] = None, path: Sequence[str] = (), extended_formats: Optional[dict] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+    """
+    Incrementally parses a (huge) json array according to a schema, yielding its items one at a time.
+    See JsonSchemaParser.iter_items().
+
+    :param fp: a text or binary stream of the json document
+    :param schema: the schema to check according to
+    :param path: the keys of the objects leading to the array, empty for a top level array
+    :param extended_formats: more formats for string parsing
+    :param chunk_size: the size of each read from the stream
+    """
+    parser = get_parser(schema, extended_formats=extended_formats)
+    return parser.iter_items(fp, path=path, chunk_size=chunk_size)
+
+
+def load_file(file_path: str | os.PathLike, schema: Optional[dict] = None, extended_formats: Optional[dict] = None):
+    """
+    Parses a json file according to a schema, the file is memory mapped instead of read into a string.
+    See JsonSchemaParser.load_file().
+
+    :param file_path: the path of the json file
+    :param schema: the schema to check according to
+    :param extended_formats: more formats for string parsing
+    """
+    parser = get_parser(schema, extended_formats=extended_formats)
+    return parser.load_file(file_path)
+
+
+def get_parser(schema: Optional[dict] = None, extended_formats: Optional[list[Type[Formatter] | Formatter]] = None) \
+        -> 'JsonSchemaParser':
+    """
+    Returns a parser of the schema from a process wide LRU cache, so equal schemas with the same formatters are
+    compiled once. The cached parser is compiled from a copy of the schema. A schema object that was passed recently is
+    looked up by its identity, so a schema that is changed in place is not detected: pass a changed copy instead.
+    The parser uses the default json backend.
+
+    :param schema: the schema to check according to
+    :param extended_formats: more formats for string parsing
+    """
+    json_backend = get_backend()
+    identity = (id(schema), tuple(extended_formats or ()))
+    try:
+        hash(identity)
+    except TypeError:
+        identity = None
+
+    _, key = _keys.get(identity, lambda _: (schema, fingerprint(schema, extended_formats)))
+    if key is not None:
+        key = (key, json_backend.name)
+
+    return _parsers.get(key, lambda _: JsonSchemaParser(copy.deepcopy(schema), extended_formats=extended_formats,
+                                                        json_backend=json_backend))
+
+
+def clear_cache():
+    """
+    Drops all the cached parsers and resets the cache statistics.
+    """
+    _parsers.clear()
+    _keys.clear()
+
+
+def cache_info() -> CacheInfo:
+    """
+    Returns the hits, misses, size limit and current size of the parsers cache.
+    """
+    return _parsers.info()
+
+
+def set_cache_size(maxsize: int):
+    """
+    Sets the maximal number of cached parsers, 0 disables the cache.
+    """
+    _parsers.resize(maxsize)
+    _keys.resize(maxsize)
+
+
 class JsonSchemaParser:
+    """
+    Parses json according to a json schema. The schema is compiled once when the parser is created.
 
-    def __init__(self, schema: Optional[dict] = None, extended_formats: Optional[list[Type[Formatter] | Formatter]] = None):
+    :param schema: the schema to check according to
+    :param extended_formats: more formats for string parsing
+    :param backend: "interpreter" walks the compiled schema nodes, "codegen" generates specialized python source for
+        the schema and executes it, "iterative" walks the compiled schema nodes with an explicit work stack instead of
+        python calls, for deeply nested documents
+    :param lazy: if True, objects and arrays are parsed to read only mapping and sequence views, and formatted strings
+        are only checked when parsed and decoded the first time they are read, unless their format is checked by
+        decoding it (supported by the "interpreter" backend)
+    :param format_cache_size: the size of the decoded values cache of every cacheable format the parser creates (the
+        formatter instances in extended_formats are used as they are), 0 disables the caches
+    :param records: if True, objects are parsed to records of their schema's shape, with their properties in __slots__
+        (see Record), instead of dicts
+    :param json_backend: decodes and encodes the jsons: "orjson", "msgspec" or "stdlib", by default the stdlib (see
+        get_backend()). The fast backends are faster, but orjson decodes integers that do not fit in 64 bits to floats
+        and their encoding is compact
+    :param max_depth: the maximal nesting depth of the documents parsed by the "iterative" backend
+    """
+
+    def __init__(self, schema: Optional[dict] = None, extended_formats: Optional[list[Type[Formatter] | Formatter]] = None,
+                 backend: str = 'interpreter', lazy: bool = False, format_cache_size: int = 0, records: bool = False,
+                 json_backend: Optional[str | JsonBackend] = None, max_depth: int = DEFAULT_MAX_DEPTH):
 
         self._formats: dict[str, Formatter] = {}
-        all_formats = DEFAULT_FORMATS
+        all_formats = list(DEFAULT_FORMATS)
         if extended_formats is not None:
             all_formats += extended_formats
 
         for f in all_formats:
             if not isinstance(f, Formatter):
                 f = f()
+                if format_cache_size and f.cacheable:
+                    f.set_cache_size(format_cache_size)
 
             self._formats[f.symbol] = f
 
         self._orig_schema = schema
+        if lazy and backend != 'interpreter':
+            raise ValueError(f'lazy parsing is not supported by the "{backend}" backend')
+
+        if lazy and records:
+            raise ValueError('lazy parsing is not supported with records')
+
+        self._node: Node = SchemaCompiler(schema, self._formats, lazy=lazy, records=records).compile(schema)
+        self._json = get_backend(json_backend)
+        self._backend = backend
+        self._lazy = lazy
+        self._max_depth = max_depth
+        self._init_backend()
+
+    def _init_backend(self):
+        self._source: Optional[str] = None
+        match self._backend:
+            case 'interpreter' if self._lazy:
+                self._parse = self._parse_lazy
+
+            case 'interpreter':
+                self._parse = self._node.parse
+
+            case 'codegen':
+                generated = generate(self._node)
+                self._source = generated.source
+                self._parse = generated.function
 
-    def loads(self, raw: str | bytes):
-        obj = json.loads(raw)
+            case 'iterative':
+                self._parse = partial(parse_iterative, self._node, max_depth=self._max_depth)
+
+            case _:
+                raise ValueError(f'backend "{self._backend}" is not supported')
+
+    def _parse_lazy(self, obj):
+        return materialize(self._node.parse(obj))
+
+    def __getstate__(self):
+        # the generated code can not be pickled, it is generated again from the compiled nodes
+        state = dict(self.__dict__)
+        del state['_parse'], state['_source']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_backend()
+
+    def format_cache_info(self) -> dict[str, CacheInfo]:
+        """
+        Returns the statistics of the decoded values cache of every format whose cache is enabled, by format symbol.
+        """
+        return {symbol: f.cache_info() for symbol, f in self._formats.items() if f.cache_info() is not None}
+
+    @property
+    def source(self) -> Optional[str]:
+        """
+        The generated python source of the parser, None if the parser does not use the "codegen" backend.
+        """
+        return self._source
+
+    def loads(self, raw: str | bytes | memoryview):
+        obj = self._json.loads(raw)
         return self.parse(obj)
 
     def parse(self, obj):
-        schema = deepcopy(self._orig_schema)
-        return self._loado(obj, schema)
+        return self._parse(obj)
 
-    def _loado(self, obj, schema: dict):
+    def load_file(self, file_path: str | os.PathLike):
         """
-        Like loads only handling an object instead of raw json.
+        Like loads() for a json file. The file is memory mapped and the mapped buffer is decoded directly, so neither
+        the file's bytes nor a string of it are read into memory first (the "stdlib" json backend copies the bytes).
 
-        :param obj: the object to parse according to the schema
-        :param schema: the schema to check according to
+        :param file_path: the path of the json file
         """
-        if '$ref' in schema:
-            return self._resolve_refs(obj, schema['$ref'])
+        with map_file(file_path) as buffer, memoryview(buffer) as view:
+            return self.loads(view)
 
-        return self._handle_composition(obj, schema)
+    def dumps(self, obj, validate: bool = False, **kwargs) -> str:
+        """
+        Like json.dumps(), only that the values are encoded according to the schema, with the formatter of each field
+        (e.g. datetime for type "string" and format "date-time"). The opposite of loads().
 
-    def _resolve_refs(self, obj, ref: str):
-        if not isinstance(ref, str):
-            raise ValueError('$ref has to be a string')
+        :param obj: the object to encode
+        :param validate: if True, the encoded object is validated according to the schema
+        :param kwargs: stdlib json additional parameters, the json is encoded by the parser's json backend when there
+            are none
+        """
+        encoded = self.encode(obj, validate=validate)
+        return json.dumps(encoded, **kwargs) if kwargs else self._json.dumps(encoded)
 
-        if not ref.startswith('#'):
-            raise ValueError(f'ref "{ref}" is not supported')
+    def iter_dumps(self, obj, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs) -> Iterator[str]:
+        """
+        Like dumps(), only that the json text is yielded in chunks while it is encoded, so a large object is never held
+        as one string. Sub schemas of "anyOf" and "oneOf" are picked by encoding their whole value to json compatible
+        types, then its text is split as well.
+
+        :param obj: the object to encode
+        :param chunk_size: the minimal size of each chunk (the last one may be smaller), larger chunks mean less writes
+            and more memory
+        :param kwargs: stdlib json.JSONEncoder parameters, "indent" is not supported
+        """
+        encoder = json.JSONEncoder(**kwargs)
+        if encoder.indent is not None:
+            raise ValueError('"indent" is not supported when encoding in chunks')
 
-        path = ref.split('/')[1:]
+        return iter_chunks(self._node.iter_encode(obj, encoder), chunk_size)
 
-        schema = self._orig_schema
-        for key in path:
-            schema = schema[key]
+    def dump(self, obj, fp: IO, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Like json.dump(), only that the values are encoded according to the schema (see dumps()), and the json is
+        written in chunks while it is encoded (see iter_dumps()).
+
+        :param obj: the object to encode
+        :param fp: a text or binary stream to write to, binary streams get utf-8
+        :param chunk_size: the minimal size of each write
+        :param kwargs: stdlib json.JSONEncoder parameters, "indent" is not supported
+        """
+        write_chunks(self.iter_dumps(obj, chunk_size=chunk_size, **kwargs), fp)
 
-        return self._loado(obj, schema)
+    def encode(self, obj, validate: bool = False):
+        """
+        Encodes a pythonic object to json compatible types according to the schema, the opposite of parse().
 
-    def _handle_composition(self, obj, schema: dict):
-        all_of = schema.pop('allOf', None)
-        any_of = schema.pop('anyOf', None)
-        one_of = schema.pop('oneOf', None)
-        not_ = schema.pop('not', None)
+        :param obj: the object to encode
+        :param validate: if True, the encoded object is validated according to the schema
+        """
+        encoded = self._node.encode(obj)
+        if validate:
+            self._node.validate(encoded)
 
-        if not any((any_of, all_of, one_of, not_)):
-            return self._handle_schema(obj, schema)
+        return encoded
 
-        ret = obj
+    def is_valid(self, obj) -> bool:
+        """
+        Checks if the object is valid according to the schema, without raising exceptions or building the parsed result.
 
-        if not_ is not None:
-            any_of_passed = False
+        :param obj: the object to check
+        """
+        if self._backend == 'iterative':
+            # the nodes' own checks take python calls for every level
             try:
-                self._loado(obj, dict(**schema, **not_))
-                any_of_passed = True
+                validate_iterative(self._node, obj, max_depth=self._max_depth)
             except ValueError:
-                pass
-
-            if any_of_passed:
-                raise ValueError('should not match the schema')
-
-        if all_of is not None:
-            for sub_schema in all_of[::-1]:
-                ret = self._loado(obj, dict(**schema, **sub_schema))
-
-        if any_of is not None:
-            any_of_passed = False
-            for sub_schema in any_of[::-1]:
-                # noinspection PyBroadException
-                try:
-                    ret = self._loado(obj, dict(**schema, **sub_schema))
-                    any_of_passed = True
-                    break
-                except Exception:
-                    pass
-            if not any_of_passed:
-                raise ValueError('not passed any of the "anyOf" options')
-
-        if one_of is not None:
-            one_of_passed = 0
-            for sub_schema in one_of[::-1]:
-                try:
-                    ret = self._loado(obj, dict(**schema, **sub_schema))
-                    one_of_passed += 1
-                except ValueError:
-                    pass
-
-            if one_of_passed != 1:
-                raise ValueError('should apply only to one of the schemas')
+                return False
 
-        return ret
-
-    def _handle_schema(self, obj, schema: dict):
-        if 'const' in schema:
-            if schema['const'] != obj:
-                raise ValueError(f'value should be: {schema["const"]}')
+            return True
 
-            return obj
+        return self._node.is_valid(obj)
 
-        match schema.get('type'):
-            case None:
-                return obj  # schema does not define a strict type, e.g. {"Title": "My Object"}
+    def validate(self, obj):
+        """
+        Validates the object according to the schema and raises a ValueError if it is not valid. Unlike parse(), no
+        result is built and formats are only checked, not decoded.
 
-            case 'object':
-                return self._object(obj, schema)
+        :param obj: the object to validate
+        """
+        if self._backend == 'iterative':
+            validate_iterative(self._node, obj, max_depth=self._max_depth)
+            return
 
-            case 'array':
-                return self.validate_array(obj, schema)
+        self._node.validate(obj)
 
-            case 'string':
-                return validate_string(obj, schema, formats=self._formats)
+    def loads_many(self, raws: Iterable[str | bytes], raise_errors: bool = True) -> list:
+        """
+        Parses many jsons with the same compiled schema.
 
-            case 'number' | 'integer':
-                return validate_number(obj, schema)
+        :param raws: the jsons to parse
+        :param raise_errors: if False, an invalid json does not stop the batch and its error (a ValueError) is returned
+            in its place
+        """
+        return self._many(raws, lambda raw: self._parse(self._json.loads(raw)), raise_errors)
 
-            case 'boolean':
-                if not isinstance(obj, bool):
-                    raise ValueError('value is not a boolean')
+    def parse_many(self, objs: Iterable, raise_errors: bool = True) -> list:
+        """
+        Parses many objects with the same compiled schema.
 
-            case 'null':
-                if obj is not None:
-                    raise ValueError('value is not null')
+        :param objs: the objects to parse
+        :param raise_errors: if False, an invalid object does not stop the batch and its error (a ValueError) is
+            returned in its place
+        """
+        return self._many(objs, self._parse, raise_errors)
 
-            case _:
-                raise ValueError(f'type {schema["type"]} is not supported')
+    def parse_parallel(self, raws: Iterable[str | bytes], workers: Optional[int] = None, chunksize: int = 1000,
+                       raise_errors: bool = True) -> list:
+        """
+        Parses raw jsons in a pool of worker processes, to use more than one CPU. The parser is sent once to each
+        worker, and the raw jsons are sent in chunks, so json decoding also happens in the workers. The parser has to
+        be picklable (e.g. custom formatters have to be defined at a module level).
+
+        :param raws: the jsons to parse
+        :param workers: the number of worker processes, by default the number of CPUs
+        :param chunksize: the number of jsons sent to a worker at a time
+        :param raise_errors: if False, an invalid json does not stop the batch and its error (a ValueError) is returned
+            in its place
+        :return: the parsed objects, in the order of the jsons
+        """
+        return loads_parallel(self, raws, workers=workers, chunksize=chunksize, raise_errors=raise_errors)
 
-        return obj
+    def iter_load(self, fp: IO, chunk_size: int = DEFAULT_CHUNK_SIZE, raise_errors: bool = True,
+                  skip_invalid: bool = False) -> Iterator:
+        """
+        Parses a stream of json lines (NDJSON), yielding the parsed records one at a time. The stream is read in large
+        chunks, so only a chunk and the current record are held in memory. Empty lines are ignored.
+
+        :param fp: a text or binary stream of json lines
+        :param chunk_size: the size of each read from the stream
+        :param raise_errors: if False, an invalid line does not stop the stream and its error (a ValueError with the
+            line number) is yielded in its place
+        :param skip_invalid: if True, invalid lines are skipped
+        """
+        parse, decode = self._parse, self._json.loads
+        for line_number, line in iter_lines(fp, chunk_size):
+            try:
+                yield parse(decode(line))
+            except ValueError as e:
+                if skip_invalid:
+                    continue
 
-    def _object(self, obj, schema: dict, **kwargs):
-        # TODO: "unevaluatedProperties", "propertyNames"
+                error = ValueError(f'line {line_number}: {e}')
+                if raise_errors:
+                    raise error from e
 
-        if not isinstance(obj, dict):
-            raise ValueError('value is not a dict')
+                yield error
 
-        self._validate_object_size(obj, schema)
+    def iter_load_file(self, file_path: str | os.PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       raise_errors: bool = True, skip_invalid: bool = False) -> Iterator:
+        """
+        Like iter_load() for a json lines (NDJSON) file, which is memory mapped.
 
-        self._conditionals(obj, schema, **kwargs)
+        :param file_path: the path of the json lines file
+        :param chunk_size: the size of each read from the mapped file
+        :param raise_errors: if False, an invalid line does not stop the stream and its error is yielded in its place
+        :param skip_invalid: if True, invalid lines are skipped
+        """
+        with map_file(file_path) as buffer:
+            yield from self.iter_load(buffer or io.BytesIO(), chunk_size=chunk_size, raise_errors=raise_errors,
+                                      skip_invalid=skip_invalid)
 
-        ret = dict()
+    def iter_items_file(self, file_path: str | os.PathLike, path: Sequence[str] = (),
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+        """
+        Like iter_items() for a json file, which is memory mapped.
 
-        properties_schema = schema.get('properties')
-        pattern_properties = schema.get('patternProperties')
-        remaining_keys = set(obj.keys())
-        for key, value in dict(obj).items():
-            if properties_schema is not None and key in properties_schema:
-                ret[key] = self._loado(value, properties_schema[key])
-                remaining_keys.remove(key)
-                continue
+        :param file_path: the path of the json file
+        :param path: the keys of the objects leading to the array, empty for a top level array
+        :param chunk_size: the size of each read from the mapped file
+        """
+        with map_file(file_path) as buffer:
+            yield from self.iter_items(buffer or io.BytesIO(), path=path, chunk_size=chunk_size)
 
-            if pattern_properties is not None:
-                for pattern, sub_schema in pattern_properties.items():
-                    if re.search(pattern, key):
-                        ret[key] = self._loado(value, sub_schema)
-                        remaining_keys.remove(key)
-                        break
-
-        additional_properties = schema.get('additionalProperties')
-        if additional_properties is False and len(remaining_keys) > 0:
-            raise ValueError(f'additional properties are not allowed')
-        elif isinstance(additional_properties, dict):
-            for key in remaining_keys:
-                ret[key] = self._loado(obj[key], additional_properties)
-        else:
-            for key in remaining_keys:
-                ret[key] = obj[key]
+    def iter_items(self, fp: IO, path: Sequence[str] = (), chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+        """
+        Incrementally parses a (huge) json array, e.g. a top level array or {"items": [...]}, without reading the whole
+        document. Each item is parsed according to the "items"/"prefixItems" of the array's schema and yielded as soon
+        as it is read, so the memory depends on the largest item and not on the whole document.
 
-        return ret
+        Only the array is validated, the values before it are skipped and the rest of the document is not read.
 
-    def _conditionals(self, obj, schema: dict, **kwargs):
-        """
-        Conditional are sets of validation options that do not affect the result objects type.
+        :param fp: a text or binary stream of the json document
+        :param path: the keys of the objects leading to the array, e.g. ("items",) for {"items": [...]}, empty for a top
+            level array
+        :param chunk_size: the size of each read from the stream
         """
-        if 'required' in schema:
-            for key in schema['required']:
-                if key not in obj:
-                    raise ValueError(f'filed "{key}" is required')
+        node = self._node
+        for key in path:
+            if isinstance(node, AnyNode):
+                break
 
-        if 'dependentRequired' in schema:
-            for dependent, dependencies in schema['dependentRequired'].items():
-                for dependency in dependencies:
-                    if dependent in obj and dependency not in obj:
-                        raise ValueError(f'"{dependent}" in dependent in "{dependency}"')
+            if not isinstance(node, ObjectNode):
+                raise ValueError(f'the schema of "{key}" parent is not an "object" schema')
 
-        # TODO: should work link allOf not in here
-        if 'dependentSchemas' in schema:
-            for dependent, dependency_schema in schema['dependentSchemas'].items():
-                if dependent in obj:
-                    self._loado(obj[dependent], dependency_schema)
+            node = node.properties.get(key) or node.match_pattern(key) or node.additional_properties or AnyNode()
 
-        if 'if' in schema:
-            try:
-                self._loado(obj, schema['if'])
-            except ValueError:
-                if 'else' in schema:
-                    self._loado(obj, schema['else'])
-            else:
-                if 'then' in schema:
-                    self._loado(obj, schema['then'])
+        items = iter_array(fp, path=path, chunk_size=chunk_size, loads=self._json.loads)
+        if isinstance(node, AnyNode):
+            return items
 
-    @staticmethod
-    def _validate_object_size(obj: dict, schema: dict):
-        if 'minProperties' in schema and len(obj) < schema['minProperties']:
-            raise ValueError(f'object should be longer then {schema["minProperties"]} items')
+        if not isinstance(node, ArrayNode):
+            raise ValueError('streaming is supported only for "array" schemas')
 
-        if 'maxProperties' in schema and len(obj) > schema['maxProperties']:
-            raise ValueError(f'object should be shorter then {schema["maxProperties"]} items')
+        return node.iter_parse(items)
 
-    def validate_array(self, obj, schema: dict, **kwargs):
-        if not isinstance(obj, list):
-            raise ValueError('value is not an array')
+    async def aloads(self, raw: str | bytes, executor: Optional[Executor] = None,
+                     threshold: int = ASYNC_EXECUTOR_THRESHOLD):
+        """
+        Like loads() for asyncio code. Large jsons are parsed in an executor so they do not block the event loop, small
+        ones are parsed right away since handing them to an executor costs more than parsing them.
 
-        self._validate_array_range(obj, schema)
+        :param raw: the json to parse
+        :param executor: the executor to parse large jsons in, by default the event loop's default executor
+        :param threshold: the length from which a json is parsed in the executor
+        """
+        if len(raw) < threshold:
+            return self.loads(raw)
 
-        contains_count, contains_schema, contains_min, contains_max = 0, None, None, None
-        if 'contains' in schema:
-            contains_schema = schema['contains']
-            contains_min = schema.get('minContains', 1)
-            contains_max = schema.get('maxContains', None)
+        return await asyncio.get_running_loop().run_in_executor(executor, self.loads, raw)
 
-        ret, unique_check = [], set()
-        for i, item in enumerate(obj):
-            if schema.get('uniqueItems') is True:
-                unique_check.add(item)
+    async def aiter_lines(self, stream: AsyncIterable[str | bytes], executor: Optional[Executor] = None,
+                          threshold: int = ASYNC_EXECUTOR_THRESHOLD, yield_every: int = 100,
+                          raise_errors: bool = True, skip_invalid: bool = False) -> AsyncIterator:
+        """
+        Parses json lines (NDJSON) from an async stream, e.g. an asyncio.StreamReader, yielding the parsed records.
+        Large lines are parsed in an executor, and the control is given back to the event loop every few lines, so
+        other tasks are not blocked by a fast stream.
+
+        :param stream: an async iterable of json lines, or an asyncio.StreamReader, whose lines are read whatever its
+            limit is
+        :param executor: the executor to parse large lines in, by default the event loop's default executor
+        :param threshold: the length from which a line is parsed in the executor
+        :param yield_every: the number of lines parsed between giving the control back to the event loop
+        :param raise_errors: if False, an invalid line does not stop the stream and its error (a ValueError with the
+            line number) is yielded in its place
+        :param skip_invalid: if True, invalid lines are skipped
+        """
+        if isinstance(stream, asyncio.StreamReader):
+            stream = aiter_reader_lines(stream)
 
-            if 'contains' in schema:
-                try:
-                    self._loado(item, contains_schema)
-                    contains_count += 1
-                except ValueError:
-                    pass
+        line_number = 0
+        async for line in stream:
+            line_number += 1
+            if not line.strip():
+                continue
 
-            ret.append(self._handle_array_item(i, item, schema))
+            try:
+                record = await self.aloads(line, executor=executor, threshold=threshold)
+            except ValueError as e:
+                if skip_invalid:
+                    continue
 
-        if 'contains' in schema and \
-                (contains_count < contains_min or (contains_max is not None and contains_count > contains_max)):
-            raise ValueError('value does not comply with the "contains" rules')
+                error = ValueError(f'line {line_number}: {e}')
+                if raise_errors:
+                    raise error from e
 
-        if schema.get('uniqueItems') is True and len(unique_check) != len(obj):
-            raise ValueError('array values are not unique')
+                record = error
 
-        return ret
+            yield record
 
-    @staticmethod
-    def _validate_array_range(obj: list, schema: dict):
-        if 'minItems' in schema and len(obj) < schema['minItems']:
-            raise ValueError('array length does not match "minItems"')
+            if line_number % yield_every == 0:
+                await asyncio.sleep(0)
 
-        if 'maxItems' in schema and len(obj) > schema['maxItems']:
-            raise ValueError('array length does not match "maxItems"')
+    @staticmethod
+    def _many(items: Iterable, parse, raise_errors: bool) -> list:
+        if not isinstance(items, Collection):
+            items = list(items)
 
-    def _handle_array_item(self, index: int, item, schema: dict, **kwargs):
-        if 'prefixItems' in schema:
-            if index < len(schema['prefixItems']):
-                return self._loado(item, schema['prefixItems'][index])
+        ret = [None] * len(items)
+        if raise_errors:
+            for i, item in enumerate(items):
+                ret[i] = parse(item)
 
-            if schema.get('items') is False:
-                raise ValueError('more items are not allowed')
+            return ret
 
-        if 'items' in schema:
-            return self._loado(item, schema['items'])
+        for i, item in enumerate(items):
+            try:
+                ret[i] = parse(item)
+            except ValueError as e:
+                ret[i] = e
 
-        return item
+        return ret
@@ -0,0 +1,341 @@
+import json
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Optional, Iterator, TYPE_CHECKING
+
+from pyjschema.canonical import canonical
+
+if TYPE_CHECKING:
+    from pyjschema.discriminator import Discriminator
+
+
+class Node:
+    """
+    A node is a compiled part of a json schema. The node holds the keywords of its schema already sorted out, so parsing
+    a document only walks the document and not the schema.
+    """
+
+    def parse(self, obj) -> Any:
+        """
+        Validates the object according to the node and returns it in pythonic types.
+
+        :param obj: the object to parse
+        """
+        raise NotImplementedError
+
+    def encode(self, obj) -> Any:
+        """
+        Encodes a pythonic object to json compatible types according to the node, the opposite of parse().
+        Formatted values are encoded by their formatter, other values are returned as they are.
+
+        :param obj: the object to encode
+        """
+        return obj
+
+    def iter_encode(self, obj, encoder: json.JSONEncoder) -> Iterator[str]:
+        """
+        Like encode(), only that the json text of the object is yielded in fragments, so objects and arrays are never
+        held as one string.
+
+        :param obj: the object to encode
+        :param encoder: encodes the json values that are not split
+        """
+        yield encoder.encode(self.encode(obj))
+
+    def is_valid(self, obj) -> bool:
+        """
+        Checks if the object is valid according to the node, without raising exceptions or building the result.
+
+        :param obj: the object to check
+        """
+        try:
+            self.parse(obj)
+        except ValueError:
+            return False
+
+        return True
+
+    def validate(self, obj):
+        """
+        Validates the object according to the node and raises a ValueError if it is not valid. Unlike parse(), valid
+        objects are only walked: no result is built and formats are only checked, not decoded.
+
+        :param obj: the object to validate
+        """
+        if not self.is_valid(obj):
+            # parsing the invalid object again finds the reason it is invalid
+            self.parse(obj)
+            raise ValueError('value is not valid')
+
+
+class AnyNode(Node):
+    """
+    A schema that does not define a strict type, e.g. {"title": "My Object"}, or the boolean schema `true`.
+    """
+
+    def parse(self, obj):
+        return obj
+
+    def is_valid(self, obj) -> bool:
+        return True
+
+
+class NeverNode(Node):
+    """
+    The boolean schema `false`, no value is allowed.
+    """
+
+    def __init__(self, message: str = 'value is not allowed'):
+        self.message = message
+
+    def parse(self, obj):
+        raise ValueError(self.message)
+
+    def is_valid(self, obj) -> bool:
+        return False
+
+
+class UnsupportedNode(Node):
+
+    def __init__(self, type_):
+        self.type = type_
+
+    def parse(self, obj):
+        raise ValueError(f'type {self.type} is not supported')
+
+    def is_valid(self, obj) -> bool:
+        return False
+
+
+class ConstNode(Node):
+    """
+    Handles the "const" keyword, with the equality of json schema (see canonical()).
+    """
+
+    def __init__(self, const):
+        self.const = const
+        self.key = canonical(const)
+
+    def parse(self, obj):
+        if canonical(obj) != self.key:
+            raise ValueError(f'value should be: {self.const}')
+
+        return obj
+
+    def is_valid(self, obj) -> bool:
+        return canonical(obj) == self.key
+
+
+class EnumNode(Node):
+    """
+    Handles the "enum" keyword, with the equality of json schema (see canonical()). The values are hashed once, so
+    checking a value does not depend on the number of values. The rest of the schema is checked by its own node.
+    """
+
+    def __init__(self, enum: list, node: Node):
+        self.enum = enum
+        self.keys = frozenset(map(canonical, enum))
+        self.node = node
+
+    def parse(self, obj):
+        if canonical(obj) not in self.keys:
+            raise ValueError('value is not one of the "enum" values')
+
+        return self.node.parse(obj)
+
+    def encode(self, obj):
+        return self.node.encode(obj)
+
+    def iter_encode(self, obj, encoder: json.JSONEncoder) -> Iterator[str]:
+        return self.node.iter_encode(obj, encoder)
+
+    def is_valid(self, obj) -> bool:
+        return canonical(obj) in self.keys and self.node.is_valid(obj)
+
+
+class BooleanNode(Node):
+
+    def parse(self, obj):
+        if not isinstance(obj, bool):
+            raise ValueError('value is not a boolean')
+
+        return obj
+
+    def is_valid(self, obj) -> bool:
+        return isinstance(obj, bool)
+
+
+class NullNode(Node):
+
+    def parse(self, obj):
+        if obj is not None:
+            raise ValueError('value is not null')
+
+        return obj
+
+    def is_valid(self, obj) -> bool:
+        return obj is None
+
+
+# the sub schemas that CompositionNode.pick() picked during the current parse, by the ids of the node and the object
+_picks: ContextVar[Optional[dict[tuple[int, int], tuple]]] = ContextVar('picks', default=None)
+
+
+def is_picking() -> bool:
+    """
+    True within parse_picking().
+    """
+    return _picks.get() is not None
+
+
+def parse_picking(parse: Callable[[Any], Any], obj):
+    """
+    Calls parse(obj) with a new memo of the sub schemas that compositions picked. A composition picks its sub schemas
+    by checking them, which checks the compositions nested in them, so parsing a picked sub schema finds their picks
+    instead of checking every level again.
+    """
+    token = _picks.set({})
+    try:
+        return parse(obj)
+    finally:
+        _picks.reset(token)
+
+
+class CompositionNode(Node):
+    """
+    Handles the "allOf", "anyOf", "oneOf" and "not" keywords. Every sub schema is compiled merged with the rest of the
+    keywords of the schema it appears in.
+
+    The sub schemas of "anyOf" and "oneOf" that are a tagged union are checked through a discriminator, which picks
+    the sub schemas that can match the object.
+    """
+
+    def __init__(self, all_of: Optional[list[Node]], any_of: Optional[list[Node]], one_of: Optional[list[Node]],
+                 not_: Optional[Node], any_of_discriminator: Optional['Discriminator'] = None,
+                 one_of_discriminator: Optional['Discriminator'] = None):
+        self.all_of = all_of
+        self.any_of = any_of
+        self.one_of = one_of
+        self.not_ = not_
+        self.any_of_discriminator = any_of_discriminator
+        self.one_of_discriminator = one_of_discriminator
+
+    def parse(self, obj):
+        if self.any_of is None and self.one_of is None or _picks.get() is not None:
+            return self._parse(obj)
+
+        return parse_picking(self._parse, obj)
+
+    def _parse(self, obj):
+        ret = obj
+
+        if self.not_ is not None and self.not_.is_valid(obj):
+            raise ValueError('should not match the schema')
+
+        if self.all_of is not None:
+            for node in self.all_of:
+                ret = node.parse(obj)
+
+        # only the picked sub schemas are parsed, the rest are only checked
+        any_of, one_of = self.pick(obj)
+        if self.any_of is not None:
+            if any_of is None:
+                raise ValueError('not passed any of the "anyOf" options')
+            ret = self.any_of[any_of].parse(obj)
+
+        if self.one_of is not None:
+            if one_of is None:
+                raise ValueError('should apply only to one of the schemas')
+            ret = self.one_of[one_of].parse(obj)
+
+        return ret
+
+    def encode(self, obj):
+        if self.all_of:
+            return self.all_of[-1].encode(obj)
+
+        return self._encoding(obj)[1]
+
+    def iter_encode(self, obj, encoder: json.JSONEncoder) -> Iterator[str]:
+        if self.all_of:
+            return self.all_of[-1].iter_encode(obj, encoder)
+
+        # the sub schema is picked by encoding the whole value to json compatible types, its text is still split
+        node, _ = self._encoding(obj)
+        if node is None:
+            return super().iter_encode(obj, encoder)
+
+        return node.iter_encode(obj, encoder)
+
+    def _encoding(self, obj) -> tuple[Optional[Node], Any]:
+        # the first sub schema whose encoding is valid for it, and the encoding
+        for node in (self.any_of or []) + (self.one_of or []):
+            # noinspection PyBroadException
+            try:
+                encoded = node.encode(obj)
+            except Exception:
+                continue
+
+            if node.is_valid(encoded):
+                return node, encoded
+
+        return None, obj
+
+    def is_valid(self, obj) -> bool:
+        if self.not_ is not None and self.not_.is_valid(obj):
+            return False
+
+        if self.all_of is not None and not all(node.is_valid(obj) for node in self.all_of):
+            return False
+
+        if self.any_of is None and self.one_of is None:
+            return True
+
+        picked = self._pick(obj)
+        picks = _picks.get()
+        if picks is not None:
+            # kept for parsing the object later in the parse, the object is held so its id is not reused
+            picks[(id(self), id(obj))] = (obj, picked)
+
+        any_of, one_of = picked
+        return (self.any_of is None or any_of is not None) and (self.one_of is None or one_of is not None)
+
+    def pick(self, obj) -> tuple[Optional[int], Optional[int]]:
+        """
+        Returns the indices of the sub schemas the object is parsed by: the first valid one of "anyOf" and the only
+        valid one of "oneOf". An index is None if there is no such sub schema, or if the keyword is missing.
+        Within a parse, the picks of is_valid() are kept, so the compositions nested in a picked sub schema are not
+        checked again when it is parsed.
+        """
+        picks = _picks.get()
+        if picks:
+            picked = picks.get((id(self), id(obj)))
+            if picked is not None and picked[0] is obj:
+                return picked[1]
+
+        return self._pick(obj)
+
+    def _pick(self, obj) -> tuple[Optional[int], Optional[int]]:
+        any_of = one_of = None
+        if self.any_of is not None:
+            for i in self._candidates(self.any_of, self.any_of_discriminator, obj):
+                if self.any_of[i].is_valid(obj):
+                    any_of = i
+                    break
+            else:
+                return None, None
+
+        if self.one_of is not None:
+            for i in self._candidates(self.one_of, self.one_of_discriminator, obj):
+                if self.one_of[i].is_valid(obj):
+                    if one_of is not None:
+                        return any_of, None
+                    one_of = i
+
+        return any_of, one_of
+
+    @staticmethod
+    def _candidates(nodes: list[Node], discriminator: Optional['Discriminator'], obj) -> Iterable[int]:
+        if discriminator is None:
+            return range(len(nodes))
+
+        return discriminator.indices(obj)
@@ -1,22 +1,44 @@
+from pyjschema.node import Node
 
 
 def validate_number(obj, schema: dict):
-    if not (isinstance(obj, float) or isinstance(obj, int)):
-        raise ValueError('value is not a number')
+    return NumberNode(schema).parse(obj)
 
-    if 'minimum' in schema and obj < schema['minimum']:
-        raise ValueError(f'value is less then {schema["minimum"]}')
 
-    if 'exclusiveMinimum' in schema and obj <= schema['exclusiveMinimum']:
-        raise ValueError(f'value is less or equal then {schema["exclusiveMinimum"]}')
+class NumberNode(Node):
 
-    if 'maximum' in schema and obj > schema['maximum']:
-        raise ValueError(f'value is more then {schema["maximum"]}')
+    def __init__(self, schema: dict):
+        self.minimum = schema.get('minimum')
+        self.exclusive_minimum = schema.get('exclusiveMinimum')
+        self.maximum = schema.get('maximum')
+        self.exclusive_maximum = schema.get('exclusiveMaximum')
+        self.multiple_of = schema.get('multipleOf')
 
-    if 'exclusiveMaximum' in schema and obj >= schema['exclusiveMaximum']:
-        raise ValueError(f'value is more or equal then {schema["exclusiveMaximum"]}')
+    def parse(self, obj):
+        if not isinstance(obj, (float, int)):
+            raise ValueError('value is not a number')
 
-    if 'multipleOf' in schema and not (obj / schema['multipleOf']).is_integer():
-        raise ValueError(f'value is not a multiply {schema["multipleOf"]}')
+        if self.minimum is not None and obj < self.minimum:
+            raise ValueError(f'value is less then {self.minimum}')
 
-    return obj
+        if self.exclusive_minimum is not None and obj <= self.exclusive_minimum:
+            raise ValueError(f'value is less or equal then {self.exclusive_minimum}')
+
+        if self.maximum is not None and obj > self.maximum:
+            raise ValueError(f'value is more then {self.maximum}')
+
+        if self.exclusive_maximum is not None and obj >= self.exclusive_maximum:
+            raise ValueError(f'value is more or equal then {self.exclusive_maximum}')
+
+        if self.multiple_of is not None and not (obj / self.multiple_of).is_integer():
+            raise ValueError(f'value is not a multiply {self.multiple_of}')
+
+        return obj
+
+    def is_valid(self, obj) -> bool:
+        return isinstance(obj, (float, int)) and \
+            (self.minimum is None or obj >= self.minimum) and \
+            (self.exclusive_minimum is None or obj > self.exclusive_minimum) and \
+            (self.maximum is None or obj <= self.maximum) and \
+            (self.exclusive_maximum is None or obj < self.exclusive_maximum) and \
+            (self.multiple_of is None or (obj / self.multiple_of).is_integer())
@@ -0,0 +1,239 @@
+import json
+import re
+from collections.abc import Mapping
+from typing import Callable, Optional, Iterator
+
+from pyjschema.node import Node
+
+
+class ObjectNode(Node):
+    # TODO: "unevaluatedProperties", "propertyNames"
+
+    def __init__(self, schema: dict, compile_: Callable[[dict], Node]):
+        self.min_properties = schema.get('minProperties')
+        self.max_properties = schema.get('maxProperties')
+
+        self.required: list[str] = schema.get('required', [])
+        self.dependent_required: dict[str, list[str]] = schema.get('dependentRequired', {})
+        self.dependent_schemas: dict[str, Node] = \
+            {key: compile_(sub_schema) for key, sub_schema in schema.get('dependentSchemas', {}).items()}
+
+        self.if_: Optional[Node] = None
+        self.then: Optional[Node] = None
+        self.else_: Optional[Node] = None
+        if 'if' in schema and ('then' in schema or 'else' in schema):
+            self.if_ = compile_(schema['if'])
+            self.then = compile_(schema['then']) if 'then' in schema else None
+            self.else_ = compile_(schema['else']) if 'else' in schema else None
+
+        self.properties: dict[str, Node] = \
+            {key: compile_(sub_schema) for key, sub_schema in schema.get('properties', {}).items()}
+        self.pattern_properties: list[tuple[re.Pattern, Node]] = \
+            [(re.compile(pattern), compile_(sub_schema))
+             for pattern, sub_schema in schema.get('patternProperties', {}).items()]
+        self.patterns_regex: Optional[re.Pattern] = _combine_patterns([p for p, _ in self.pattern_properties])
+
+        additional_properties = schema.get('additionalProperties')
+        self.no_additional_properties = additional_properties is False
+        self.additional_properties: Optional[Node] = \
+            compile_(additional_properties) if isinstance(additional_properties, dict) else None
+
+    def parse(self, obj):
+        if not isinstance(obj, dict):
+            raise ValueError('value is not a dict')
+
+        self._validate_object_size(obj)
+
+        self._conditionals(obj)
+
+        ret = dict()
+        properties = self.properties
+        for key, value in obj.items():
+            node = properties.get(key)
+            if node is None:
+                node = self.match_pattern(key)
+
+            if node is not None:
+                ret[key] = node.parse(value)
+            elif self.no_additional_properties:
+                raise ValueError(f'additional properties are not allowed')
+            elif self.additional_properties is not None:
+                ret[key] = self.additional_properties.parse(value)
+            else:
+                ret[key] = value
+
+        return ret
+
+    def encode(self, obj):
+        # records and named tuples
+        if hasattr(obj, '_asdict'):
+            obj = obj._asdict()
+
+        if not isinstance(obj, Mapping):
+            return obj
+
+        ret = dict()
+        for key, value in obj.items():
+            node = self._value_node(key)
+            ret[key] = node.encode(value) if node is not None else value
+
+        return ret
+
+    def iter_encode(self, obj, encoder: json.JSONEncoder) -> Iterator[str]:
+        if hasattr(obj, '_asdict'):
+            obj = obj._asdict()
+
+        if not isinstance(obj, Mapping) or not obj:
+            yield encoder.encode(self.encode(obj))
+            return
+
+        items = sorted(obj.items()) if encoder.sort_keys else obj.items()
+        separator = '{'
+        for key, value in items:
+            text = _key_text(key, encoder)
+            if text is None:
+                continue
+
+            yield separator + encoder.encode(text) + encoder.key_separator
+
+            node = self._value_node(key)
+            if node is not None:
+                yield from node.iter_encode(value, encoder)
+            else:
+                yield encoder.encode(value)
+
+            separator = encoder.item_separator
+
+        yield '}'
+
+    def _value_node(self, key: str) -> Optional[Node]:
+        node = self.properties.get(key)
+        if node is None:
+            node = self.match_pattern(key) or self.additional_properties
+
+        return node
+
+    def is_valid(self, obj) -> bool:
+        if not isinstance(obj, dict) or \
+                (self.min_properties is not None and len(obj) < self.min_properties) or \
+                (self.max_properties is not None and len(obj) > self.max_properties):
+            return False
+
+        for key in self.required:
+            if key not in obj:
+                return False
+
+        for dependent, dependencies in self.dependent_required.items():
+            if dependent in obj and any(dependency not in obj for dependency in dependencies):
+                return False
+
+        for dependent, node in self.dependent_schemas.items():
+            if dependent in obj and not node.is_valid(obj[dependent]):
+                return False
+
+        if self.if_ is not None:
+            node = self.then if self.if_.is_valid(obj) else self.else_
+            if node is not None and not node.is_valid(obj):
+                return False
+
+        properties = self.properties
+        for key, value in obj.items():
+            node = properties.get(key)
+            if node is None:
+                node = self.match_pattern(key)
+
+            if node is None:
+                if self.no_additional_properties:
+                    return False
+
+                node = self.additional_properties
+
+            if node is not None and not node.is_valid(value):
+                return False
+
+        return True
+
+    def match_pattern(self, key: str) -> Optional[Node]:
+        if self.patterns_regex is not None:
+            match = self.patterns_regex.match(key)
+            return self.pattern_properties[int(match.lastgroup[1:])][1] if match is not None else None
+
+        for pattern, node in self.pattern_properties:
+            if pattern.search(key):
+                return node
+
+        return None
+
+    def _conditionals(self, obj: dict):
+        """
+        Conditional are sets of validation options that do not affect the result objects type.
+        """
+        for key in self.required:
+            if key not in obj:
+                raise ValueError(f'filed "{key}" is required')
+
+        for dependent, dependencies in self.dependent_required.items():
+            for dependency in dependencies:
+                if dependent in obj and dependency not in obj:
+                    raise ValueError(f'"{dependent}" in dependent in "{dependency}"')
+
+        # TODO: should work link allOf not in here
+        for dependent, node in self.dependent_schemas.items():
+            if dependent in obj:
+                node.validate(obj[dependent])
+
+        if self.if_ is not None:
+            node = self.then if self.if_.is_valid(obj) else self.else_
+            if node is not None:
+                node.validate(obj)
+
+    def _validate_object_size(self, obj: dict):
+        if self.min_properties is not None and len(obj) < self.min_properties:
+            raise ValueError(f'object should be longer then {self.min_properties} items')
+
+        if self.max_properties is not None and len(obj) > self.max_properties:
+            raise ValueError(f'object should be shorter then {self.max_properties} items')
+
+
+# back references are numbered by the groups of the pattern, so such patterns can not be combined with others
+_BACK_REFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+# inline flags apply to the whole combined regex (on python < 3.11), not only to their pattern
+_INLINE_FLAGS = re.compile(r'\(\?[aiLmsux-]+[:)]')
+
+
+def _combine_patterns(patterns: list[re.Pattern]) -> Optional[re.Pattern]:
+    """
+    Combines the patterns to one regex testing all of them in one pass. The group named "p<i>" of the match is the
+    first pattern (by order) that is found in the key, just like searching each of them in order.
+
+    :return: the combined regex, None if there are less than two patterns or they can not be combined
+    """
+    if len(patterns) < 2 or \
+            any(p.groupindex or p.flags & ~re.UNICODE or _BACK_REFERENCE.search(p.pattern) or
+                _INLINE_FLAGS.search(p.pattern) for p in patterns):
+        return None
+
+    try:
+        return re.compile('|'.join(f'(?=(?s:.*?)(?P<p{i}>{p.pattern}))' for i, p in enumerate(patterns)))
+    except re.error:
+        return None
+
+
+def _key_text(key, encoder: json.JSONEncoder) -> Optional[str]:
+    # the keys json.dumps() converts to strings, None for a key that is skipped
+    if isinstance(key, str):
+        return key
+
+    if key is True or key is False or key is None:
+        return json.dumps(key)
+
+    if isinstance(key, float):
+        return encoder.encode(key)
+
+    if isinstance(key, int):
+        return int.__repr__(key)
+
+    if encoder.skipkeys:
+        return None
+
+    raise TypeError(f'keys must be str, int, float, bool or None, not {type(key).__name__}')
@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Iterable, Optional
+
+# the parser of the worker process, sent once when the worker starts
+_worker_parser = None
+
+
+def loads_parallel(parser, raws: Iterable[str | bytes], workers: Optional[int] = None, chunksize: int = 1000,
+                   raise_errors: bool = True) -> list:
+    """
+    Parses raw jsons in a pool of processes. The parser (with its compiled schema and formatters) is sent once to each
+    worker, and the raw jsons are sent in chunks, so json decoding also happens in the workers.
+
+    :param parser: the JsonSchemaParser to parse with, it has to be picklable
+    :param raws: the jsons to parse
+    :param workers: the number of worker processes, by default the number of CPUs
+    :param chunksize: the number of jsons sent to a worker at a time
+    :param raise_errors: if False, an invalid json does not stop the batch and its error is returned in its place
+    :return: the parsed objects, in the order of the jsons
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(parser,)) as executor:
+        ret = []
+        for chunk in executor.map(partial(_loads_chunk, raise_errors=raise_errors), _chunks(raws, chunksize)):
+            ret.extend(chunk)
+
+        return ret
+
+
+def _chunks(items: Iterable, size: int) -> Iterable[list]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def _init_worker(parser):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _loads_chunk(raws: list[str | bytes], raise_errors: bool) -> list:
+    return _worker_parser.loads_many(raws, raise_errors=raise_errors)
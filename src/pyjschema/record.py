@@ -0,0 +1,162 @@
+import keyword
+from functools import lru_cache
+from typing import Iterator, Any
+
+from pyjschema.object import ObjectNode
+
+_EXTRA = '_extra'
+
+
+class Record:
+    """
+    A parsed object of a fixed shape, whose properties are held in __slots__ instead of a dict. The properties are
+    attributes (when their name is an identifier) and items, e.g. record.name and record["name"]. Properties that are
+    not in the shape are held in a side dict, only if the object schema allows them.
+
+    Records of the same shape share a class, created by record_class().
+    """
+    __slots__ = ()
+    __hash__ = None
+
+    _fields: tuple[str, ...] = ()
+    _field_set: frozenset[str] = frozenset()
+    _has_extra: bool = False
+
+    @classmethod
+    def from_dict(cls, obj: dict) -> 'Record':
+        record = cls.__new__(cls)
+        extra = None
+        fields = cls._field_set
+        for key, value in obj.items():
+            if key in fields:
+                setattr(record, key, value)
+            elif cls._has_extra:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                raise ValueError(f'property "{key}" is not a field of the record')
+
+        if cls._has_extra:
+            object.__setattr__(record, _EXTRA, extra)
+
+        return record
+
+    def _asdict(self) -> dict[str, Any]:
+        """
+        Returns the properties of the record as a dict.
+        """
+        ret = {}
+        for field in self._fields:
+            try:
+                ret[field] = getattr(self, field)
+            except AttributeError:
+                pass
+
+        if self._has_extra and getattr(self, _EXTRA) is not None:
+            ret.update(getattr(self, _EXTRA))
+
+        return ret
+
+    def __getitem__(self, key: str):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+
+        if self._has_extra and getattr(self, _EXTRA) is not None:
+            return getattr(self, _EXTRA)[key]
+
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._asdict())
+
+    def __len__(self) -> int:
+        return len(self._asdict())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            return self._asdict() == other._asdict()
+
+        if isinstance(other, dict):
+            return self._asdict() == other
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({", ".join(f"{key}={value!r}" for key, value in self._asdict().items())})'
+
+    def __reduce__(self):
+        # the record classes are created at runtime, so a record is pickled by its shape
+        return _rebuild, (type(self).__name__, self._fields, self._has_extra, self._asdict())
+
+
+@lru_cache(maxsize=None)
+def record_class(name: str, fields: tuple[str, ...], has_extra: bool) -> type[Record]:
+    """
+    Returns the record class of a shape, the same class for the same shape.
+
+    :param name: the name of the class
+    :param fields: the properties that are held in slots, valid identifiers that do not start with "_" and are not
+        attributes of Record
+    :param has_extra: if True, other properties are held in a side dict
+    """
+    slots = fields + ((_EXTRA,) if has_extra else ())
+    return type(name, (Record,),
+                {'__slots__': slots, '_fields': fields, '_field_set': frozenset(fields), '_has_extra': has_extra})
+
+
+def _rebuild(name: str, fields: tuple[str, ...], has_extra: bool, obj: dict) -> Record:
+    return record_class(name, fields, has_extra).from_dict(obj)
+
+
+def _is_field(key: str) -> bool:
+    # the names of Record's own attributes (e.g. "from_dict") would replace them in the class
+    return key.isidentifier() and not keyword.iskeyword(key) and not key.startswith('_') and not hasattr(Record, key)
+
+
+class RecordObjectNode(ObjectNode):
+    """
+    Parses objects to records of the object schema's shape: its "properties" are the fields of the record, and the
+    rest of the properties (of "patternProperties", "additionalProperties" or names that are not identifiers) are held
+    in a side dict.
+    """
+
+    def __init__(self, schema: dict, compile_):
+        super().__init__(schema, compile_)
+
+        fields = tuple(key for key in self.properties if _is_field(key))
+        has_extra = len(fields) != len(self.properties) or bool(self.pattern_properties) or \
+            not self.no_additional_properties
+        title = schema.get('title', '')
+        name = title if _is_field(title) and title[0].isupper() else 'Record'
+        self.record_type = record_class(name, fields, has_extra)
+
+    def parse(self, obj):
+        return self.record_type.from_dict(super().parse(obj))
+
+    def __getstate__(self):
+        # the record classes are created at runtime, so the node is pickled with the shape of its records
+        state = dict(self.__dict__)
+        record_type = state.pop('record_type')
+        state['record_shape'] = (record_type.__name__, record_type._fields, record_type._has_extra)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.record_type = record_class(*self.__dict__.pop('record_shape'))
+
+
+RECORD_NODES = {
+    ObjectNode: RecordObjectNode,
+}
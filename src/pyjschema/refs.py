@@ -0,0 +1,101 @@
+from typing import Optional
+from urllib.parse import urljoin, urldefrag, unquote
+
+# keywords holding data and not sub schemas, "$id"s inside them should not be indexed
+_DATA_KEYWORDS = frozenset(('const', 'enum', 'default', 'examples'))
+
+
+class RefResolver:
+    """
+    Indexes a schema once, so "$ref"s are resolved without walking the schema for every visit.
+
+    Supports json pointers (with "~0"/"~1" and percent escaping), "$id" based resources and "$anchor"s.
+    """
+
+    def __init__(self, root: Optional[dict | bool]):
+        self._root = root
+        self._resources: dict[str, dict | bool] = {}
+        self._anchors: dict[tuple[str, str], dict] = {}
+        self._bases: dict[int, str] = {}
+
+        base = ''
+        if isinstance(root, dict) and isinstance(root.get('$id'), str):
+            base = urldefrag(root['$id']).url
+
+        self._resources[base] = root
+        self._root_base = base
+        self._index(root, base)
+
+    def base_uri(self, schema: dict) -> str:
+        """
+        The base uri of the given schema, according to the "$id"s of the schemas containing it.
+        """
+        return self._bases.get(id(schema), self._root_base)
+
+    def inherit(self, schema: dict, origin: dict):
+        """
+        Makes a schema that was built from another schema (e.g. by merging) to have the base uri of the origin.
+        """
+        self._bases[id(schema)] = self.base_uri(origin)
+
+    def resolve(self, ref: str, base: str = '') -> dict | bool:
+        """
+        Resolves a "$ref" to the schema it points to.
+
+        :param ref: the reference
+        :param base: the base uri of the schema the reference appears in
+        """
+        if not isinstance(ref, str):
+            raise ValueError('$ref has to be a string')
+
+        resource, fragment = urldefrag(urljoin(base, ref))
+        if not resource:
+            resource = urldefrag(base).url
+
+        if resource not in self._resources:
+            raise ValueError(f'ref "{ref}" is not supported')
+
+        schema = self._resources[resource]
+        if not fragment:
+            return schema
+
+        if not fragment.startswith('/'):
+            if (resource, fragment) not in self._anchors:
+                raise ValueError(f'ref "{ref}" could not be resolved')
+
+            return self._anchors[(resource, fragment)]
+
+        try:
+            for token in unquote(fragment).split('/')[1:]:
+                token = token.replace('~1', '/').replace('~0', '~')
+                schema = schema[int(token)] if isinstance(schema, list) else schema[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f'ref "{ref}" could not be resolved')
+
+        return schema
+
+    def _index(self, schema, base: str):
+        if isinstance(schema, list):
+            for item in schema:
+                self._index(item, base)
+            return
+
+        if not isinstance(schema, dict):
+            return
+
+        if isinstance(schema.get('$id'), str):
+            resource, fragment = urldefrag(urljoin(base, schema['$id']))
+            if fragment:
+                # an "$id" of a plain name fragment, e.g. {"$id": "#foo"} acts like an anchor
+                self._anchors[(resource or base, fragment)] = schema
+            else:
+                base = resource
+                self._resources.setdefault(base, schema)
+
+        if isinstance(schema.get('$anchor'), str):
+            self._anchors[(base, schema['$anchor'])] = schema
+
+        self._bases[id(schema)] = base
+        for key, value in schema.items():
+            if key not in _DATA_KEYWORDS:
+                self._index(value, base)
@@ -0,0 +1,298 @@
+import asyncio
+import codecs
+import json
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from typing import IO, Iterator, Sequence, Any, Iterable, Callable, AsyncIterator
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def iter_lines(fp: IO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple[int, str | bytes]]:
+    """
+    Reads a text or binary stream in large chunks and yields its non-empty lines with their line numbers (starting at
+    1). Binary streams that support readinto() are read into one reusable buffer.
+
+    :param fp: the stream to read
+    :param chunk_size: the size of each read from the stream
+    """
+    if hasattr(fp, 'readinto') and not hasattr(fp, 'encoding'):
+        yield from _iter_binary_lines(fp, chunk_size)
+        return
+
+    line_number, pending = 0, None
+    while chunk := fp.read(chunk_size):
+        lines = chunk.split('\n' if isinstance(chunk, str) else b'\n')
+        if pending:
+            lines[0] = pending + lines[0]
+
+        pending = lines.pop()
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+
+    if pending and pending.strip():
+        yield line_number + 1, pending
+
+
+async def aiter_reader_lines(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """
+    Yields the lines of an asyncio stream reader. Unlike iterating the reader, lines that are longer than the reader's
+    limit (64 KiB by default) are read as well.
+
+    :param reader: the reader to read
+    """
+    pending = bytearray()
+    while True:
+        try:
+            line = await reader.readuntil(b'\n')
+        except asyncio.LimitOverrunError as e:
+            # the part of the line in the reader's buffer is taken out, so the reader reads the rest of it
+            pending += await reader.readexactly(e.consumed)
+            continue
+        except asyncio.IncompleteReadError as e:
+            # the last line, without a line break
+            if pending or e.partial:
+                yield bytes(pending) + e.partial
+            return
+
+        if pending:
+            line = bytes(pending) + line
+            pending.clear()
+
+        yield line
+
+
+def _iter_binary_lines(fp: IO[bytes], chunk_size: int) -> Iterator[tuple[int, bytes]]:
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    line_number, pending = 0, bytearray()
+
+    while size := fp.readinto(view):
+        start = 0
+        while (end := buffer.find(b'\n', start, size)) != -1:
+            if pending:
+                pending += view[start:end]
+                line = bytes(pending)
+                pending.clear()
+            else:
+                line = bytes(view[start:end])
+
+            start = end + 1
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+
+        pending += view[start:size]
+
+    if pending.strip():
+        yield line_number + 1, bytes(pending)
+
+
+def iter_array(fp: IO, path: Sequence[str] = (), chunk_size: int = DEFAULT_CHUNK_SIZE,
+               loads: Callable[[str], Any] = json.loads) -> Iterator[Any]:
+    """
+    Incrementally reads a json document holding a (huge) array and yields the array's items one at a time, without
+    reading the whole document. Only the array is read, the values before it are skipped and the rest of the
+    document is not read.
+
+    :param fp: a text or binary stream of the json document
+    :param path: the keys of the objects leading to the array, e.g. ("items",) for {"items": [...]}, empty for a top
+        level array
+    :param chunk_size: the size of each read from the stream
+    :param loads: decodes the json of an item
+    """
+    reader = _IncrementalReader(fp, chunk_size)
+
+    for key in path:
+        reader.expect('{')
+        while True:
+            if reader.peek() != '"':
+                raise ValueError(f'key "{key}" was not found')
+
+            current = json.loads(reader.read_value())
+            reader.expect(':')
+            if current == key:
+                break
+
+            reader.read_value()
+            if reader.peek() != ',':
+                raise ValueError(f'key "{key}" was not found')
+
+            reader.expect(',')
+
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+
+    while True:
+        yield loads(reader.read_value())
+
+        match reader.peek():
+            case ',':
+                reader.expect(',')
+            case ']':
+                return
+            case _:
+                raise ValueError('expected "," or "]" between array items')
+
+
+@contextmanager
+def map_file(path: str | os.PathLike) -> Iterator[mmap.mmap | bytes]:
+    """
+    Memory maps a file for reading, so its content is read from the page cache when it is accessed and not copied into
+    memory up front. The mapped file is a bytes-like buffer and also a binary stream (read()). An empty file, which
+    can not be mapped, is an empty bytes.
+
+    :param path: the path of the file
+    """
+    with open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            yield b''
+            return
+
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_chunks(fragments: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Joins small text fragments into chunks of at least chunk_size characters (except the last one), so writing them
+    does not cost a call for every fragment.
+
+    :param fragments: the fragments to join
+    :param chunk_size: the minimal size of each chunk
+    """
+    pending, size = [], 0
+    for fragment in fragments:
+        pending.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield ''.join(pending)
+            pending, size = [], 0
+
+    if pending:
+        yield ''.join(pending)
+
+
+def write_chunks(chunks: Iterable[str], fp: IO):
+    """
+    Writes text chunks to a text or binary stream, binary streams get them encoded in utf-8.
+
+    :param chunks: the chunks to write
+    :param fp: the stream to write to
+    """
+    binary = not hasattr(fp, 'encoding')
+    for chunk in chunks:
+        fp.write(chunk.encode() if binary else chunk)
+
+
+# the characters that can open or close a nested value, and the ones that can end a string
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_STRING_END = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[\s,\]}]')
+
+
+class _IncrementalReader:
+    """
+    Reads json values from a stream chunk by chunk. The buffer only holds the value that is being read, so the memory
+    depends on the largest value and not on the whole document.
+    """
+
+    def __init__(self, fp: IO, chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = None if hasattr(fp, 'encoding') else codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """
+        Reads another chunk, dropping the part of the buffer that was already read.
+
+        :return: False at the end of the stream
+        """
+        raw = self._fp.read(self._chunk_size)
+        # a read that ends inside a utf-8 character is decoded to less characters, even to none
+        chunk = raw if isinstance(raw, str) else self._decoder.decode(raw, final=not raw)
+
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return bool(raw)
+
+    def peek(self) -> str:
+        """
+        Skips whitespaces and returns the next character, an empty string at the end of the stream.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\n\r':
+                self._pos += 1
+
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f'expected "{char}" in json')
+
+        self._pos += 1
+
+    def read_value(self) -> str:
+        """
+        Reads the raw json text of the next value.
+        """
+        first = self.peek()
+        if not first:
+            raise ValueError('unexpected end of json')
+
+        start = i = self._pos
+        depth, in_string = 0, first == '"'
+        if in_string:
+            i += 1
+        elif first not in '{[':
+            while (match := _SCALAR_END.search(self._buffer, i)) is None:
+                i = len(self._buffer) - start
+                more = self._fill_value(start)
+                start = 0
+                if not more:
+                    break
+
+            self._pos = match.start() if match is not None else len(self._buffer)
+            return self._buffer[start:self._pos]
+
+        while True:
+            match = (_STRING_END if in_string else _STRUCTURE).search(self._buffer, i)
+            if match is None:
+                i = max(i, len(self._buffer))
+                if not self._fill_value(start):
+                    raise ValueError('unexpected end of json')
+                i, start = i - start, 0
+                continue
+
+            char, i = match.group(), match.end()
+            if in_string:
+                if char == '\\':
+                    i += 1
+                    continue
+
+                in_string = False
+                if depth == 0:
+                    break
+            elif char == '"':
+                in_string = True
+            elif char in '{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    break
+
+        self._pos = i
+        return self._buffer[start:i]
+
+    def _fill_value(self, start: int) -> bool:
+        self._pos = start
+        return self._fill()
@@ -1,6 +1,7 @@
 import re
-from typing import Type
+from typing import Type, Optional
 
+from pyjschema.node import Node
 from pyjschema.string.formatter import Formatter, UUIDFormat, DatetimeFormat, TimeFormat, DateFormat, EmailFormatter, \
     Ipv4Formatter, Ipv6Formatter, DurationFormatter, HostnameFormatter
 
@@ -18,34 +19,62 @@ DEFAULT_FORMATS: list[Type[Formatter]] = [
 
 
 def validate_string(obj, schema: dict, formats: dict[str, Formatter]):
-    if not isinstance(obj, str):
-        raise ValueError('value is not a string')
+    return StringNode(schema, formats).parse(obj)
 
-    _length(obj, schema)
-    _pattern(obj, schema)
 
-    f = schema.get('format')
-    if f is None:
-        return obj
+class StringNode(Node):
 
-    try:
-        if f not in formats:
-            raise ValueError(f'format {f} is not supported')
+    def __init__(self, schema: dict, formats: dict[str, Formatter]):
+        self.min_length = schema.get('minLength')
+        self.max_length = schema.get('maxLength')
+        self.pattern: Optional[re.Pattern] = re.compile(schema['pattern']) if 'pattern' in schema else None
+        self.format: Optional[str] = schema.get('format')
+        self.formatter: Optional[Formatter] = formats.get(self.format) if self.format is not None else None
 
-        return formats.get(f).decode(obj)
+    def parse(self, obj):
+        if not isinstance(obj, str):
+            raise ValueError('value is not a string')
 
-    except Exception as e:
-        raise ValueError(f'error in formatting data, format: {schema["format"]}, error: {e}')
+        self._length(obj)
+        self._pattern(obj)
 
+        if self.format is None:
+            return obj
 
-def _pattern(s: str, schema: dict):
-    if 'pattern' in schema and not bool(re.fullmatch(schema['pattern'], s)):
-        raise ValueError('value does not comply with the pattern')
+        try:
+            if self.formatter is None:
+                raise ValueError(f'format {self.format} is not supported')
 
+            return self.formatter.cached_decode(obj)
 
-def _length(s: str, schema: dict):
-    if 'minLength' in schema and len(s) < schema['minLength']:
-        raise ValueError(f"min length should be {schema['minLength']}, got {len(s)}")
+        except Exception as e:
+            raise ValueError(f'error in formatting data, format: {self.format}, error: {e}')
 
-    if 'maxLength' in schema and len(s) > schema['maxLength']:
-        raise ValueError(f"max length should be {schema['maxLength']}, got {len(s)}")
+    def encode(self, obj):
+        if self.formatter is None or isinstance(obj, str):
+            return obj
+
+        return self.formatter.encode(obj)
+
+    def is_valid(self, obj) -> bool:
+        if not isinstance(obj, str) or \
+                (self.min_length is not None and len(obj) < self.min_length) or \
+                (self.max_length is not None and len(obj) > self.max_length) or \
+                (self.pattern is not None and self.pattern.fullmatch(obj) is None):
+            return False
+
+        if self.format is None:
+            return True
+
+        return self.formatter is not None and self.formatter.is_valid(obj)
+
+    def _pattern(self, s: str):
+        if self.pattern is not None and self.pattern.fullmatch(s) is None:
+            raise ValueError('value does not comply with the pattern')
+
+    def _length(self, s: str):
+        if self.min_length is not None and len(s) < self.min_length:
+            raise ValueError(f"min length should be {self.min_length}, got {len(s)}")
+
+        if self.max_length is not None and len(s) > self.max_length:
+            raise ValueError(f"max length should be {self.max_length}, got {len(s)}")
@@ -1,9 +1,11 @@
+import calendar
+import re
 from datetime import datetime, time, date, timedelta
 from ipaddress import IPv4Address, IPv6Address
-from typing import Any
+from typing import Any, Optional
 from uuid import UUID
 
-from fqdn import FQDN
+from pyjschema.cache import LRUCache, CacheInfo
 
 
 class Formatter:
@@ -11,9 +13,44 @@ class Formatter:
     Formatter is a class that is defining a format of the "string" type in Json-Schema.
     Each format has a symbol that is presented in the schema (under "format") and defines the encode and decode methods
     for handling conversions between raw strings and pythonic objects of the format.
+
+    Formats whose decoded objects are immutable are "cacheable", their decoded objects can be memoized by a cache of
+    the most recently decoded values, so a repeated value is decoded once and its decoded object is shared.
+
+    :param cache_size: the size of the decoded values cache of a cacheable format, 0 disables the cache
     """
 
     symbol: str = None
+    cacheable: bool = False
+
+    _cache: Optional[LRUCache] = None
+
+    def __init__(self, cache_size: int = 0):
+        self.set_cache_size(cache_size)
+
+    def set_cache_size(self, cache_size: int):
+        """
+        Sets the size of the decoded values cache, 0 disables it.
+        """
+        if cache_size and not self.cacheable:
+            raise ValueError(f'format {self.symbol} is not cacheable')
+
+        self._cache = LRUCache(cache_size) if cache_size else None
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """
+        Returns the hits, misses, size limit and current size of the decoded values cache, None if it is disabled.
+        """
+        return self._cache.info() if self._cache is not None else None
+
+    def cached_decode(self, raw: str) -> Any:
+        """
+        Like decode(), through the decoded values cache if it is enabled.
+        """
+        if self._cache is None:
+            return self.decode(raw)
+
+        return self._cache.get(raw, self.decode)
 
     def decode(self, raw: str) -> Any:
         """
@@ -27,9 +64,32 @@ class Formatter:
         """
         raise NotImplemented
 
+    def is_valid(self, raw: str) -> bool:
+        """
+        Checks if a raw json text is valid according to the format, without keeping the decoded object. Formats can
+        override it with a check that is cheaper than decoding.
+        """
+        # noinspection PyBroadException
+        try:
+            self.cached_decode(raw)
+        except Exception:
+            return False
+
+        return True
+
+    @property
+    def checks_without_decoding(self) -> bool:
+        """
+        True if the format overrides is_valid() with its own check, False if checking a value decodes it.
+        """
+        return type(self).is_valid is not Formatter.is_valid
+
 
 class UUIDFormat(Formatter):
     symbol = 'uuid'
+    cacheable = True
+
+    _hex = re.compile('[0-9a-fA-F]{32}')
 
     def encode(self, data: UUID) -> str:
         return str(data)
@@ -37,39 +97,95 @@ class UUIDFormat(Formatter):
     def decode(self, raw: str) -> UUID:
         return UUID(raw)
 
+    def is_valid(self, raw: str) -> bool:
+        # the same forms UUID() accepts, e.g. "{...}" or "urn:uuid:..."
+        hex_digits = raw.replace('urn:', '').replace('uuid:', '').strip('{}').replace('-', '')
+        return self._hex.fullmatch(hex_digits) is not None
+
+
+def _utc_suffix(raw: str) -> str:
+    # fromisoformat() supports "Z" only since python 3.11
+    return raw[:-1] + '+00:00' if raw.endswith(('Z', 'z')) else raw
+
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# the RFC 3339 time, with the fractions fromisoformat() accepts before python 3.11
+_HOURS = r'(?:[01][0-9]|2[0-3])'
+_TIME = rf'{_HOURS}:[0-5][0-9]:[0-5][0-9](?:\.[0-9]{{3}}(?:[0-9]{{3}})?)?(?:[Zz]|[+-]{_HOURS}:[0-5][0-9])?'
+
+
+def _is_date(year: str, month: str, day: str) -> bool:
+    year, month, day = int(year), int(month), int(day)
+    if year < 1 or not 1 <= month <= 12:
+        return False
+
+    return 1 <= day <= _DAYS_IN_MONTH[month - 1] + (month == 2 and calendar.isleap(year))
+
 
 class DatetimeFormat(Formatter):
     symbol = 'date-time'
+    cacheable = True
 
     def encode(self, data: datetime) -> str:
         return data.isoformat()
 
     def decode(self, raw: str) -> datetime:
-        return datetime.fromisoformat(raw)
+        return datetime.fromisoformat(_utc_suffix(raw))
+
+    _datetime = re.compile(rf'([0-9]{{4}})-([0-9]{{2}})-([0-9]{{2}})T{_TIME}')
+
+    def is_valid(self, raw: str) -> bool:
+        # the RFC 3339 form is checked by its pattern, the other forms fromisoformat() accepts by decoding them
+        match = self._datetime.fullmatch(raw)
+        if match is None:
+            return super().is_valid(raw)
+
+        return _is_date(*match.groups())
 
 
 class TimeFormat(Formatter):
     symbol = 'time'
+    cacheable = True
 
     def encode(self, data: time) -> str:
         return data.isoformat()
 
     def decode(self, raw: str) -> time:
-        return time.fromisoformat(raw)
+        return time.fromisoformat(_utc_suffix(raw))
+
+    _time = re.compile(_TIME)
+
+    def is_valid(self, raw: str) -> bool:
+        # the RFC 3339 form is checked by its pattern, the other forms fromisoformat() accepts by decoding them
+        return self._time.fullmatch(raw) is not None or super().is_valid(raw)
 
 
 class DateFormat(Formatter):
     symbol = 'date'
+    cacheable = True
+
+    _date = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
 
     def encode(self, data: date) -> str:
-        return data.strftime('%Y-%m-%d')
+        # also the date of a datetime
+        return date.isoformat(data)
 
     def decode(self, raw: str) -> date:
-        return datetime.strptime(raw, '%Y-%m-%d').date()
+        # fromisoformat() accepts more forms since python 3.11
+        if self._date.fullmatch(raw) is None:
+            raise ValueError(f'"{raw}" is not in a correct date format')
+
+        return date.fromisoformat(raw)
+
+    def is_valid(self, raw: str) -> bool:
+        match = self._date.fullmatch(raw)
+        return match is not None and _is_date(*match.groups())
 
 
 class EmailFormatter(Formatter):
     symbol = 'email'
+    cacheable = True
 
     def encode(self, data: str) -> str:
         return self._validate_email(data)
@@ -77,6 +193,9 @@ class EmailFormatter(Formatter):
     def decode(self, raw: str) -> str:
         return self._validate_email(raw)
 
+    def is_valid(self, raw: str) -> bool:
+        return '@' in raw
+
     @staticmethod
     def _validate_email(s: str) -> str:
         if '@' not in s:
@@ -87,6 +206,10 @@ class EmailFormatter(Formatter):
 
 class Ipv4Formatter(Formatter):
     symbol = 'ipv4'
+    cacheable = True
+
+    _octet = '(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+    _address = re.compile(rf'{_octet}(?:\.{_octet}){{3}}')
 
     def encode(self, data: IPv4Address) -> str:
         return str(data)
@@ -94,9 +217,13 @@ class Ipv4Formatter(Formatter):
     def decode(self, raw: str) -> IPv4Address:
         return IPv4Address(raw)
 
+    def is_valid(self, raw: str) -> bool:
+        return self._address.fullmatch(raw) is not None
+
 
 class Ipv6Formatter(Formatter):
     symbol = 'ipv6'
+    cacheable = True
 
     def encode(self, data: IPv6Address) -> str:
         return str(data)
@@ -104,32 +231,59 @@ class Ipv6Formatter(Formatter):
     def decode(self, raw: str) -> IPv6Address:
         return IPv6Address(raw)
 
+    _groups = re.compile(r'(?:[0-9a-fA-F]{1,4}(?::[0-9a-fA-F]{1,4})*)?')
+
+    def is_valid(self, raw: str) -> bool:
+        # addresses with an embedded ipv4 address or a scope id are checked by decoding them
+        if '.' in raw or '%' in raw:
+            return super().is_valid(raw)
+
+        # eight groups, or up to seven groups around a single "::"
+        parts = raw.split('::')
+        if len(parts) > 2 or not all(self._groups.fullmatch(part) for part in parts):
+            return False
+
+        groups = sum(part.count(':') + 1 for part in parts if part)
+        return groups == 8 if len(parts) == 1 else groups <= 7
+
 
 class DurationFormatter(Formatter):
     symbol = 'duration'
+    cacheable = True
 
-    _date_signs = {'Y': 'years', 'M': 'months', 'W': 'weeks', 'D': 'days'}
-    _time_signs = {'H': 'hours', 'M': 'minutes', 'S': 'seconds'}
+    _number = r'[0-9]+(?:[.,][0-9]+)?'
+    _duration = re.compile(
+        rf'P(?=.)(?:(?P<years>{_number})Y)?(?:(?P<months>{_number})M)?(?:(?P<weeks>{_number})W)?'
+        rf'(?:(?P<days>{_number})D)?(?:T(?=.)(?:(?P<hours>{_number})H)?(?:(?P<minutes>{_number})M)?'
+        rf'(?:(?P<seconds>{_number})S)?)?'
+    )
 
     def decode(self, s: str) -> timedelta:
-        if not s.startswith('P'):
+        match = self._duration.fullmatch(s)
+        if match is None:
             raise ValueError(f'"{s}" is not in a correct duration format')
 
-        parts = s[1:].split('T')
-        if len(parts) > 1:
-            return self._build_duration(parts[0], self._date_signs) + self._build_duration(parts[1], self._time_signs)
+        if match['years'] is not None or match['months'] is not None:
+            raise ValueError(f'"{s}" has years or months, which are not a fixed duration')
 
-        return self._build_duration(parts[0], self._date_signs)
+        try:
+            return timedelta(**{unit: float(value.replace(',', '.'))
+                                for unit, value in match.groupdict().items() if value is not None})
+        except OverflowError:
+            raise ValueError(f'"{s}" is out of the range of a duration')
 
-    @staticmethod
-    def _build_duration(s: str, signs: dict[str, str]) -> timedelta:
-        build = {}
-        last = 0
-        for i, c in enumerate(s):
-            if c in signs:
-                build[signs[c]] = float(s[last:i])
+    _seconds = {'weeks': 7 * 24 * 60 * 60, 'days': 24 * 60 * 60, 'hours': 60 * 60, 'minutes': 60, 'seconds': 1}
+    # durations that are far from the range limit of timedelta are valid without building them
+    _safe_seconds = timedelta.max.total_seconds() / 2
+
+    def is_valid(self, raw: str) -> bool:
+        match = self._duration.fullmatch(raw)
+        if match is None or match['years'] is not None or match['months'] is not None:
+            return False
 
-        return timedelta(**build)
+        seconds = sum(float(match[unit].replace(',', '.')) * factor
+                      for unit, factor in self._seconds.items() if match[unit] is not None)
+        return seconds < self._safe_seconds or super().is_valid(raw)
 
     def encode(self, data: timedelta) -> str:
         # split seconds to larger units
@@ -159,16 +313,15 @@ class DurationFormatter(Formatter):
         if seconds.is_integer():
             seconds = '{:02}'.format(int(seconds))
         else:
-            # 9 chars long w/leading 0, 6 digits after decimal
-            seconds = '%09.6f' % seconds
-        # remove trailing zeros
-        seconds = seconds.rstrip('0')
+            # 9 chars long w/leading 0, 6 digits after decimal, without trailing zeros
+            seconds = ('%09.6f' % seconds).rstrip('0')
         time_string += '{}S'.format(seconds)
         return u'P' + date_string + time_string
 
 
 class HostnameFormatter(Formatter):
     symbol = 'hostname'
+    cacheable = True
 
     def decode(self, raw: str) -> str:
         return self._validate(raw)
@@ -176,9 +329,15 @@ class HostnameFormatter(Formatter):
     def encode(self, data: str) -> str:
         return self._validate(data)
 
-    @staticmethod
-    def _validate(s: str) -> str:
-        if not FQDN(s).is_valid:
+    # at least two labels of up to 63 letters, digits and hyphens (not at their edges), RFC 1035 and RFC 3696
+    _label = r'(?!-)[a-zA-Z0-9-]{1,63}(?<!-)'
+    _hostname = re.compile(rf'{_label}(?:\.{_label})+\.?')
+
+    def is_valid(self, raw: str) -> bool:
+        return len(raw.rstrip('.')) <= 253 and self._hostname.fullmatch(raw) is not None
+
+    def _validate(self, s: str) -> str:
+        if not self.is_valid(s):
             raise ValueError(f'"{s}" is not a valid hostname')
 
         return s
@@ -1,9 +1,10 @@
-from pyjschema.load import loads, _loado
+from pyjschema.backend import get_backend
+from pyjschema.load import get_parser
 
 
 def validate_raw(raw: bytes | str, schema: dict):
-    loads(raw, schema)
+    validate_obj(get_backend().loads(raw), schema)
 
 
 def validate_obj(obj, schema: dict):
-    _loado(obj, schema)
+    get_parser(schema).validate(obj)
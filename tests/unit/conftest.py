@@ -0,0 +1,29 @@
+import pytest
+
+from pyjschema import Formatter
+
+
+class CountingFormatter(Formatter):
+    """
+    A format of lowercase strings that are decoded to uppercase, it counts the values it decoded and checked.
+    """
+    symbol = 'counting'
+    decoded = 0
+    checked = 0
+
+    def decode(self, raw: str) -> str:
+        CountingFormatter.decoded += 1
+        return raw.upper()
+
+    def encode(self, data: str) -> str:
+        return data.lower()
+
+    def is_valid(self, raw: str) -> bool:
+        CountingFormatter.checked += 1
+        return raw.islower()
+
+
+@pytest.fixture
+def counting_formatter() -> type[CountingFormatter]:
+    CountingFormatter.decoded = CountingFormatter.checked = 0
+    return CountingFormatter
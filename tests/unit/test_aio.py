@@ -0,0 +1,64 @@
+import asyncio
+import uuid
+
+import pytest
+
+from pyjschema import JsonSchemaParser
+
+SCHEMA = {'type': 'object', 'properties': {'id': {'type': 'string', 'format': 'uuid'}}, 'required': ['id']}
+
+
+def test_aloads():
+    parser = JsonSchemaParser(SCHEMA)
+    raw = '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a"}'
+    expected = {'id': uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')}
+
+    assert asyncio.run(parser.aloads(raw)) == expected
+    assert asyncio.run(parser.aloads(raw, threshold=0)) == expected
+    with pytest.raises(ValueError):
+        asyncio.run(parser.aloads('{}', threshold=0))
+
+
+def test_aiter_lines():
+    ids = [uuid.uuid4() for _ in range(30)]
+    data = ''.join(f'{{"id": "{i}"}}\n' for i in ids).encode() + b'\n{"id": 1}\n'
+    parser = JsonSchemaParser(SCHEMA)
+
+    async def collect(**kwargs):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [record async for record in parser.aiter_lines(reader, yield_every=7, **kwargs)]
+
+    with pytest.raises(ValueError, match='line 32'):
+        asyncio.run(collect())
+
+    assert asyncio.run(collect(skip_invalid=True, threshold=10)) == [{'id': i} for i in ids]
+
+    result = asyncio.run(collect(raise_errors=False))
+    assert result[:-1] == [{'id': i} for i in ids]
+    assert isinstance(result[-1], ValueError)
+
+
+def test_aiter_lines_long_lines():
+    # lines that are longer than the reader's limit, and one that is the last without a line break
+    ids = [uuid.uuid4() for _ in range(3)]
+    padding = ' ' * (1 << 17)
+    data = ''.join(f'{{"id": "{i}",{padding}"n": 1}}\n' for i in ids[:2]).encode() + f'{{"id": "{ids[2]}"}}'.encode()
+    parser = JsonSchemaParser(SCHEMA)
+
+    async def collect():
+        reader = asyncio.StreamReader()
+
+        async def feed():
+            for i in range(0, len(data), 1000):
+                reader.feed_data(data[i:i + 1000])
+                await asyncio.sleep(0)
+            reader.feed_eof()
+
+        feeding = asyncio.create_task(feed())
+        records = [record async for record in parser.aiter_lines(reader)]
+        await feeding
+        return records
+
+    assert asyncio.run(collect()) == [{'id': ids[0], 'n': 1}, {'id': ids[1], 'n': 1}, {'id': ids[2]}]
@@ -1,6 +1,6 @@
 import pytest
 
-from pyjschema.load import loads
+from pyjschema.load import loads, JsonSchemaParser
 
 
 def test_items():
@@ -41,6 +41,27 @@ def test_unique():
         loads(f'[1, 2, 3, 3, 5]', schema)
 
 
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+def test_unique_json_values(backend):
+    parser = JsonSchemaParser({'type': 'array', 'uniqueItems': True}, backend=backend)
+
+    unique = [1, True, '1', None, [1, 2], [2, 1], {'a': 1, 'b': [True]}, {'a': 1, 'b': [1]}, {'a': 1}]
+    assert parser.parse(unique) == unique
+    assert parser.is_valid(unique)
+    assert list(parser._node.iter_parse(unique)) == unique
+
+    records = [{'id': i, 'tags': ['a', 'b']} for i in range(10_000)]
+    assert parser.is_valid(records)
+
+    for duplicate in ([1, 1.0], [False, False], [[1, {'x': None}], [1.0, {'x': None}]],
+                      [{'a': 1, 'b': 2}, {'b': 2, 'a': 1}], records + [{'tags': ['a', 'b'], 'id': 5}]):
+        assert not parser.is_valid(duplicate)
+        with pytest.raises(ValueError):
+            parser.parse(duplicate)
+        with pytest.raises(ValueError):
+            list(parser._node.iter_parse(duplicate))
+
+
 def test_contains():
     schema = {'type': 'array', 'contains': {'type': 'number'}}
 
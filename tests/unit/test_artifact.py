@@ -0,0 +1,110 @@
+import uuid
+
+import pytest
+
+from pyjschema import ParserStore, Formatter
+from pyjschema import artifact
+from pyjschema.string.formatter import UUIDFormat
+
+SCHEMA = {
+    '$defs': {'children': {'type': 'array', 'items': {'$ref': '#'}}},
+    'oneOf': [{'type': 'object', 'required': ['kind'],
+               'properties': {'kind': {'const': kind}, 'id': {'type': 'string', 'format': 'uuid'},
+                              'children': {'$ref': '#/$defs/children'}}} for kind in ('a', 'b', 'c')]
+}
+OBJ = {'kind': 'a', 'id': '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a', 'children': [{'kind': 'b'}]}
+
+
+class UpperFormatter(Formatter):
+    symbol = 'upper'
+
+    def decode(self, raw: str) -> str:
+        return raw.upper()
+
+    def encode(self, data: str) -> str:
+        return data.lower()
+
+
+@pytest.mark.parametrize('options', [{}, {'backend': 'codegen'}, {'records': True}])
+def test_store(tmp_path, options):
+    store = ParserStore(tmp_path / 'artifacts')
+    expected = store.get(SCHEMA, **options).parse(OBJ)
+    assert expected['id'] == uuid.UUID(OBJ['id'])
+
+    path = store.path(SCHEMA, **options)
+    mtime = path.stat().st_mtime_ns
+    loaded = ParserStore(tmp_path / 'artifacts').get(SCHEMA, **options)
+    assert loaded.parse(OBJ) == expected
+    assert path.stat().st_mtime_ns == mtime
+
+    assert store.path(SCHEMA, extended_formats=[UpperFormatter], **options) != path
+    assert store.path(dict(reversed(SCHEMA.items())), **options) != path
+    store.clear()
+    assert not path.exists()
+
+
+def test_stale_artifact(tmp_path, monkeypatch):
+    store = ParserStore(tmp_path)
+    schema = {'type': 'string', 'format': 'upper'}
+    assert store.get(schema, extended_formats=[UpperFormatter]).parse('a') == 'A'
+    path = store.path(schema, extended_formats=[UpperFormatter])
+
+    monkeypatch.setattr(artifact, 'library_version', lambda: 'other')
+    assert artifact.ParserStore._load(path, artifact._formats_key([UpperFormatter])) is None
+    assert store.get(schema, extended_formats=[UpperFormatter]).parse('a') == 'A'
+    assert artifact.ParserStore._load(path, artifact._formats_key([UpperFormatter])) is not None
+
+    path.write_bytes(b'not a pickle')
+    assert store.get(schema, extended_formats=[UpperFormatter]).parse('a') == 'A'
+    assert artifact.ParserStore._load(path, artifact._formats_key([UpperFormatter])) is not None
+
+
+def test_unpicklable_parser(tmp_path):
+    class LocalFormatter(UpperFormatter):
+        pass
+
+    store = ParserStore(tmp_path)
+    schema = {'type': 'string', 'format': 'upper'}
+    assert store.get(schema, extended_formats=[LocalFormatter]).parse('a') == 'A'
+    assert not store.path(schema, extended_formats=[LocalFormatter]).exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_formatter_instances(tmp_path):
+    store = ParserStore(tmp_path)
+    schema = {'type': 'string', 'format': 'uuid'}
+
+    # instances are keyed by their state and not by their identity, so the key is the same in another process
+    path = store.path(schema, extended_formats=[UUIDFormat(cache_size=10)])
+    assert store.path(schema, extended_formats=[UUIDFormat(cache_size=10)]) == path
+    assert store.path(schema, extended_formats=[UUIDFormat(cache_size=20)]) != path
+    assert store.path(schema, extended_formats=[UUIDFormat]) != path
+
+    parser = store.get(schema, extended_formats=[UUIDFormat(cache_size=10)])
+    assert path.exists()
+    assert store.get(schema, extended_formats=[UUIDFormat(cache_size=10)]).parse(OBJ['id']) == parser.parse(OBJ['id'])
+
+
+def test_unkeyable_formatter(tmp_path):
+    class MarkedFormatter(UpperFormatter):
+        def __init__(self):
+            super().__init__()
+            self.marker = object()
+
+    store = ParserStore(tmp_path)
+    schema = {'type': 'string', 'format': 'upper'}
+    with pytest.raises(TypeError):
+        store.path(schema, extended_formats=[MarkedFormatter()])
+
+    assert store.get(schema, extended_formats=[MarkedFormatter()]).parse('a') == 'A'
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_recursion_while_pickling(tmp_path, monkeypatch):
+    def dumps(*args, **kwargs):
+        raise RecursionError('maximum recursion depth exceeded')
+
+    monkeypatch.setattr(artifact.pickle, 'dumps', dumps)
+    store = ParserStore(tmp_path)
+    assert store.get({'type': 'integer'}).parse(1) == 1
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,88 @@
+import io
+import json
+import math
+import uuid
+
+import pytest
+
+from pyjschema import JsonSchemaParser, get_backend, set_default_backend, get_parser, loads
+from pyjschema.backend import BACKENDS, MsgspecBackend, OrjsonBackend, StdlibBackend
+
+AVAILABLE = [name for name, backend_type in BACKENDS.items() if backend_type.available]
+SCHEMA = {'type': 'object', 'properties': {'id': {'type': 'string', 'format': 'uuid'}}}
+RAW = '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "name": "א"}'
+PARSED = {'id': uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'), 'name': 'א'}
+
+
+@pytest.mark.parametrize('name', AVAILABLE)
+def test_backend(name):
+    parser = JsonSchemaParser(SCHEMA, json_backend=name)
+    data = RAW.encode()
+
+    for raw in (RAW, data, bytearray(data), memoryview(data)):
+        assert parser.loads(raw) == PARSED
+
+    assert parser.loads(parser.dumps(PARSED)) == PARSED
+    assert list(parser.iter_load(io.BytesIO(data + b'\n' + data))) == [PARSED, PARSED]
+    items_parser = JsonSchemaParser({'type': 'array', 'items': SCHEMA}, json_backend=name)
+    assert list(items_parser.iter_items(io.BytesIO(b'[' + data + b', ' + data + b']'))) == [PARSED, PARSED]
+
+    for raw in ('{"id": ', b'nope', '[1, 2'):
+        with pytest.raises(ValueError):
+            parser.loads(raw)
+
+    with pytest.raises(TypeError):
+        parser.dumps({'a': object()})
+
+
+def test_default_backend():
+    # the fast backends are used only when they are asked for
+    assert isinstance(get_backend(), StdlibBackend)
+    assert JsonSchemaParser(SCHEMA)._json.name == 'stdlib'
+
+    try:
+        set_default_backend(AVAILABLE[0])
+        assert get_backend().name == AVAILABLE[0]
+        assert get_parser(SCHEMA)._json.name == AVAILABLE[0]
+        assert loads(memoryview(RAW.encode()), SCHEMA) == PARSED
+    finally:
+        set_default_backend(None)
+
+    assert get_parser(SCHEMA)._json.name == 'stdlib'
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('simdjson')
+
+    if not MsgspecBackend.available:
+        with pytest.raises(ValueError):
+            JsonSchemaParser(SCHEMA, json_backend='msgspec')
+
+
+@pytest.mark.parametrize('name', AVAILABLE)
+def test_backend_numbers(name):
+    # the numbers the fast decoders reject are decoded like the stdlib decodes them
+    backend = get_backend(name)
+    for raw in ('{"a": 1e400, "b": -Infinity}', '[1.5, -1e400]', '9223372036854775807', '"123456789012345678901234"'):
+        assert backend.loads(raw) == json.loads(raw)
+        assert backend.loads(raw.encode()) == json.loads(raw)
+        assert backend.loads(memoryview(raw.encode())) == json.loads(raw)
+
+    assert math.isnan(backend.loads('NaN'))
+    with pytest.raises(ValueError):
+        backend.loads('[1e400')
+
+
+def test_long_integers():
+    raw = '123456789012345678901234567890'
+    assert get_backend('stdlib').loads(raw) == 123456789012345678901234567890
+    schema = {'type': 'object', 'properties': {'id': {'type': 'integer'}}}
+    assert loads(f'{{"id": {raw}}}', schema) == {'id': 123456789012345678901234567890}
+
+    for name in AVAILABLE:
+        assert json.loads(JsonSchemaParser(schema, json_backend=name).dumps({'id': 2 ** 70})) == {'id': 2 ** 70}
+
+    # a documented difference of orjson, the integer is decoded to a float
+    if OrjsonBackend.available:
+        assert get_backend('orjson').loads(raw) == float(raw)
@@ -0,0 +1,130 @@
+import sys
+import uuid
+
+import pytest
+
+from pyjschema.load import JsonSchemaParser
+
+SCHEMAS = [
+    (
+        {
+            'type': 'object',
+            'required': ['id'],
+            'properties': {
+                'id': {'type': 'string', 'format': 'uuid'},
+                'name': {'type': 'string', 'minLength': 2, 'maxLength': 5, 'pattern': '[a-z]*'},
+                'age': {'type': 'integer', 'minimum': 0, 'exclusiveMaximum': 150},
+                'tags': {'type': 'array', 'items': {'type': 'string'}, 'uniqueItems': True},
+            },
+            'patternProperties': {'^I_': {'type': 'integer'}},
+            'additionalProperties': False
+        },
+        [
+            '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a"}',
+            '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "name": "abc", "age": 3, "tags": ["a"], "I_1": 4}',
+        ],
+        [
+            '{"name": "abc"}',
+            '{"id": "not a uuid"}',
+            '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "name": "ABC"}',
+            '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "age": 150}',
+            '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "tags": ["a", "a"]}',
+            '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "I_1": "4"}',
+            '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "other": 1}',
+            '[]',
+        ]
+    ),
+    (
+        {'type': 'array', 'prefixItems': [{'type': 'number'}, {'type': 'string'}], 'items': False},
+        ['[1, "D"]', '[1]'],
+        ['[1, "D", 1]', '["D"]', '"test1"']
+    ),
+    (
+        {'type': 'array', 'contains': {'type': 'number'}, 'maxContains': 2},
+        ['["life", 42]', '[1, 2]'],
+        ['["life"]', '[1, 2, 3]']
+    ),
+    (
+        {'type': 'number', 'oneOf': [{'multipleOf': 5}, {'multipleOf': 3}], 'not': {'const': 6}},
+        ['10', '9'],
+        ['15', '2', '6', '"a"']
+    ),
+    (
+        {'anyOf': [{'type': 'string', 'format': 'date-time'}, {'type': 'null'}, {'type': 'boolean'}]},
+        ['"2018-11-13T20:20:39+00:00"', 'null', 'true'],
+        ['"2018"', '1']
+    ),
+    (
+        {
+            'type': 'object',
+            'properties': {'name': {'type': 'string'}, 'children': {'type': 'array', 'items': {'$ref': '#'}}},
+            'dependentRequired': {'a': ['b']},
+            'if': {'type': 'object', 'properties': {'name': {'const': 'x'}}, 'required': ['name']},
+            'then': {'type': 'object', 'required': ['children']},
+        },
+        ['{"name": "a", "children": [{"name": "b", "children": [{"name": "c"}]}]}', '{"name": "x", "children": []}'],
+        ['{"name": "a", "children": [{"name": 1}]}', '{"name": "x"}', '{"a": 1}']
+    ),
+    (
+        {'oneOf': [{'type': 'integer'}, {'anyOf': [{'type': 'string'}, {'type': 'null'}]}]},
+        ['1', '"a"', 'null'],
+        ['[]', '{}']
+    ),
+    (
+        {'anyOf': [{'anyOf': [{'type': 'object'}], 'type': 'string'}]},
+        ['{}'],
+        ['"a"', '1', '[]']
+    ),
+    (
+        {'type': 'array', 'prefixItems': [{'type': 'array', 'prefixItems': [{'type': 'string'}]}, {'type': 'number'}]},
+        ['[["a"], 1]', '[[], 1, "x"]'],
+        ['[[1], 1]', '[["a"], "b"]', '[1]']
+    ),
+]
+
+
+@pytest.mark.parametrize('schema, valid, invalid', SCHEMAS)
+def test_codegen_matches_interpreter(schema, valid, invalid):
+    interpreter = JsonSchemaParser(schema)
+    codegen = JsonSchemaParser(schema, backend='codegen')
+
+    for raw in valid:
+        assert codegen.loads(raw) == interpreter.loads(raw)
+
+    for raw in invalid:
+        with pytest.raises(ValueError):
+            interpreter.loads(raw)
+
+        with pytest.raises(ValueError):
+            codegen.loads(raw)
+
+
+def test_codegen_source():
+    schema = {'type': 'object', 'properties': {'uuid': {'type': 'string', 'format': 'uuid'}}}
+    parser = JsonSchemaParser(schema, backend='codegen')
+
+    assert 'def parse_0(obj):' in parser.source
+    assert JsonSchemaParser(schema).source is None
+
+    result = parser.loads('{"uuid": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a"}')
+    assert result == {'uuid': uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')}
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        JsonSchemaParser({'type': 'string'}, backend='unknown')
+
+
+@pytest.mark.parametrize('schema', [
+    {'type': 'string', 'minLength': "0 or __import__('sys').modules.__setitem__('injected', 1) or 0"},
+    {'type': 'string', 'maxLength': '{__import__("sys").modules.__setitem__("injected", 1)}'},
+    {'type': 'object', 'minProperties': "0 or __import__('sys').modules.__setitem__('injected', 1) or 0"},
+    {'type': 'array', 'maxItems': "0 or __import__('sys').modules.__setitem__('injected', 1) or 0"},
+    {'type': 'array', 'contains': {}, 'minContains': "0 or __import__('sys').modules.__setitem__('injected', 1)"},
+])
+def test_keywords_are_not_source(schema):
+    parser = JsonSchemaParser(schema, backend='codegen')
+    with pytest.raises(TypeError):
+        parser.parse('' if schema['type'] == 'string' else {} if schema['type'] == 'object' else [])
+
+    assert 'injected' not in sys.modules
@@ -1,6 +1,8 @@
+import uuid
+
 import pytest
 
-from pyjschema.load import loads
+from pyjschema.load import loads, JsonSchemaParser
 
 
 def test_all_of():
@@ -169,3 +171,119 @@ def test_with_conditionals():
           "street_address": "1600 Pennsylvania Avenue NW",
           "postal_code": "K1M 1M4"
         }''', schema)
+
+
+def test_is_valid():
+    schema = {
+        'type': 'object',
+        'properties': {
+            'value': {'anyOf': [{'type': 'string', 'format': 'uuid'}, {'type': 'number', 'minimum': 0}]},
+            'kind': {'oneOf': [{'const': 'a'}, {'const': 'b'}]},
+            'tags': {'type': 'array', 'contains': {'type': 'string'}, 'items': {'not': {'type': 'null'}}},
+        },
+        'if': {'type': 'object', 'required': ['kind']},
+        'then': {'type': 'object', 'required': ['value']},
+    }
+
+    for backend in ('interpreter', 'codegen'):
+        parser = JsonSchemaParser(schema, backend=backend)
+
+        valid = {'value': '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a', 'kind': 'a', 'tags': ['x', 1]}
+        assert parser.is_valid(valid)
+        assert parser.parse(valid)['value'] == uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')
+
+        for invalid in ({'value': 'not a uuid'}, {'value': -1}, {'kind': 'c', 'value': 1}, {'kind': 'a'},
+                        {'tags': [1]}, {'tags': ['x', None]}, []):
+            assert not parser.is_valid(invalid)
+            with pytest.raises(ValueError):
+                parser.parse(invalid)
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+def test_tagged_union(backend):
+    variants = [{'type': 'object',
+                 'properties': {'type': {'const': f'event_{i}'}, 'id': {'type': 'string', 'format': 'uuid'}},
+                 'required': ['type', 'id'], 'additionalProperties': False} for i in range(80)]
+    variants += [
+        # shares a tag with another sub schema
+        {'type': 'object', 'properties': {'type': {'const': 'event_1'}, 'extra': {'type': 'number'}},
+         'required': ['type', 'extra']},
+        # untagged
+        {'type': 'object', 'properties': {'kind': {'type': 'string'}}, 'required': ['kind']},
+    ]
+    parser = JsonSchemaParser({'oneOf': variants}, backend=backend)
+    any_of_parser = JsonSchemaParser({'anyOf': variants}, backend=backend)
+    id_ = '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'
+
+    assert parser._node.one_of_discriminator is not None
+    assert parser.parse({'type': 'event_42', 'id': id_}) == {'type': 'event_42', 'id': uuid.UUID(id_)}
+    assert parser.parse({'type': 'event_1', 'id': id_}) == {'type': 'event_1', 'id': uuid.UUID(id_)}
+    assert parser.parse({'type': 'event_1', 'extra': 1}) == {'type': 'event_1', 'extra': 1}
+    assert parser.parse({'kind': 'x', 'type': 'other'}) == {'kind': 'x', 'type': 'other'}
+    assert any_of_parser.parse({'type': 'event_1', 'id': id_, 'extra': 1}) == {'type': 'event_1', 'id': id_, 'extra': 1}
+
+    for obj in ({'type': 'event_1', 'kind': 'x', 'extra': 1}, {'type': 'event_2', 'id': id_, 'extra': 1},
+                {'type': 'event_80', 'id': id_}, {'type': ['event_1'], 'id': id_}, {'id': id_}, [], 'event_1'):
+        assert not parser.is_valid(obj)
+        with pytest.raises(ValueError):
+            parser.parse(obj)
+
+    assert any_of_parser.is_valid({'type': 'event_1', 'kind': 'x', 'extra': 1})
+    assert not any_of_parser.is_valid({'type': 'event_80', 'id': id_})
+
+
+def test_tagged_union_enum():
+    schema = {'oneOf': [
+        {'type': 'object', 'properties': {'kind': {'enum': ['a', 'b']}}, 'required': ['kind']},
+        {'type': 'object', 'properties': {'kind': {'const': 1}, 'x': {'type': 'string'}}, 'required': ['kind', 'x']},
+    ]}
+    parser = JsonSchemaParser(schema)
+
+    assert parser._node.one_of_discriminator is not None
+    assert parser.parse({'kind': 'b'}) == {'kind': 'b'}
+    assert parser.parse({'kind': 1.0, 'x': 'y'}) == {'kind': 1.0, 'x': 'y'}
+    for obj in ({'kind': True, 'x': 'y'}, {'kind': 'c'}, {'kind': {'a': 1}}):
+        with pytest.raises(ValueError):
+            parser.parse(obj)
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+@pytest.mark.parametrize('keyword', ['anyOf', 'oneOf'])
+def test_nested_composition_is_linear(backend, keyword, counting_formatter):
+    # every sub schema is walked once, not checked and then parsed again at every level
+    schema = {
+        '$defs': {
+            'node': {
+                'type': 'object',
+                'properties': {
+                    'v': {'type': 'string', 'format': 'counting'},
+                    'next': {keyword: [{'type': 'null'}, {'$ref': '#/$defs/node'}]}
+                }
+            }
+        },
+        '$ref': '#/$defs/node'
+    }
+    obj, expected = {'v': 'x', 'next': None}, {'v': 'X', 'next': None}
+    for _ in range(49):
+        obj, expected = {'v': 'x', 'next': obj}, {'v': 'X', 'next': expected}
+
+    parser = JsonSchemaParser(schema, extended_formats=[counting_formatter], backend=backend)
+    assert parser.parse(obj) == expected
+    assert counting_formatter.decoded + counting_formatter.checked <= 2 * 50
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+@pytest.mark.parametrize('keyword', ['anyOf', 'oneOf'])
+def test_only_picked_branch_is_parsed(backend, keyword, counting_formatter):
+    # the sub schemas are evaluated from the last, which fails after its formatted value: it is only checked, so the
+    # value is not decoded
+    failing = {'a': {'type': 'string', 'format': 'counting'}, 'b': {'type': 'integer'}}
+    schema = {keyword: [{'type': 'object', 'properties': {'b': {'type': 'string'}}},
+                        {'type': 'object', 'properties': failing}]}
+    parser = JsonSchemaParser(schema, extended_formats=[counting_formatter], backend=backend)
+
+    assert parser.parse({'a': 'x', 'b': 'y'}) == {'a': 'x', 'b': 'y'}
+    assert counting_formatter.decoded == 0
+
+    assert parser.parse({'a': 'x', 'b': 1}) == {'a': 'X', 'b': 1}
+    assert counting_formatter.decoded == 1
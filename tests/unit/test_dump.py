@@ -0,0 +1,142 @@
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from pyjschema import Formatter, JsonSchemaParser
+from pyjschema.dump import dumps, iter_dumps, dump
+
+
+class CsvFormatter(Formatter):
+    symbol = 'csv'
+
+    def decode(self, raw: str) -> tuple[str, ...]:
+        return tuple(raw.split(','))
+
+    def encode(self, data: tuple[str, ...]) -> str:
+        return ','.join(data)
+
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string', 'format': 'uuid'},
+        'created': {'type': 'string', 'format': 'date-time'},
+        'events': {'type': 'array', 'items': {'type': 'string', 'format': 'date-time'}},
+        'owner': {'anyOf': [{'type': 'null'}, {'type': 'string', 'format': 'uuid'}]},
+    },
+    'patternProperties': {'^r_': {'type': 'integer'}},
+    'additionalProperties': {'type': 'string', 'format': 'uuid'}
+}
+
+
+def test_dumps_schema():
+    obj = {
+        'id': uuid.uuid4(),
+        'created': datetime(2023, 1, 2, 3, 4, 5),
+        'events': (datetime(2023, 1, 1), datetime(2023, 1, 2)),
+        'owner': uuid.uuid4(),
+        'r_count': 3,
+        'other': uuid.uuid4(),
+    }
+    parser = JsonSchemaParser(SCHEMA)
+
+    raw = parser.dumps(obj)
+    assert json.loads(raw) == {
+        'id': str(obj['id']),
+        'created': '2023-01-02T03:04:05',
+        'events': ['2023-01-01T00:00:00', '2023-01-02T00:00:00'],
+        'owner': str(obj['owner']),
+        'r_count': 3,
+        'other': str(obj['other']),
+    }
+    assert parser.loads(raw) == {**obj, 'events': list(obj['events'])}
+    assert dumps(obj, SCHEMA, sort_keys=True) == parser.dumps(obj, sort_keys=True)
+    assert json.loads(parser.dumps({'id': str(obj['id']), 'owner': None})) == {'id': str(obj['id']), 'owner': None}
+
+
+def test_dumps_custom_format():
+    schema = {'type': 'array', 'items': {'type': 'string', 'format': 'csv'}}
+    parser = JsonSchemaParser(schema, extended_formats=[CsvFormatter])
+
+    assert json.loads(parser.dumps([('a', 'b'), 'c,d'])) == ['a,b', 'c,d']
+    assert json.loads(parser.dumps([('a', 'b')], validate=True)) == ['a,b']
+    assert parser.loads(parser.dumps([('a', 'b')])) == [('a', 'b')]
+
+
+def test_dumps_validate():
+    parser = JsonSchemaParser(SCHEMA)
+
+    assert json.loads(parser.dumps({'r_count': 'three'})) == {'r_count': 'three'}
+    with pytest.raises(ValueError):
+        parser.dumps({'r_count': 'three'}, validate=True)
+
+    with pytest.raises(TypeError):
+        parser.dumps({'r_count': object()})
+
+
+def test_dumps_without_schema():
+    obj = {'id': uuid.UUID(int=1), 'created': datetime(2023, 1, 2), 'data': b'ab'}
+    assert json.loads(dumps(obj)) == {'id': str(obj['id']), 'created': '2023-01-02T00:00:00', 'data': 'YWI='}
+
+    with pytest.raises(TypeError):
+        dumps({'a': object()})
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'sort_keys': True}, {'separators': (',', ':'), 'ensure_ascii': False}])
+def test_iter_dumps(kwargs):
+    obj = {
+        'owner': None,
+        'id': uuid.UUID(int=7),
+        'events': [datetime(2023, 1, 1), datetime(2023, 1, 2)],
+        'r_name': 'שלום',
+        'empty': {},
+    }
+    schema = {**SCHEMA, 'additionalProperties': True}
+    parser = JsonSchemaParser(schema, json_backend='stdlib')
+
+    chunks = list(parser.iter_dumps(obj, chunk_size=16, **kwargs))
+    assert len(chunks) > 1 and all(len(chunk) >= 16 for chunk in chunks[:-1])
+    assert ''.join(chunks) == parser.dumps(obj, **kwargs)
+    assert ''.join(iter_dumps(obj, schema, **kwargs)) == parser.dumps(obj, **kwargs)
+
+    with pytest.raises(ValueError):
+        list(parser.iter_dumps(obj, indent=2))
+
+
+def test_dump():
+    obj = [{'id': uuid.UUID(int=i), 'created': datetime(2023, 1, 1)} for i in range(100)]
+    schema = {'type': 'array', 'items': SCHEMA}
+
+    text, binary = io.StringIO(), io.BytesIO()
+    JsonSchemaParser(schema).dump(obj, text, chunk_size=64)
+    dump(obj, binary, schema, chunk_size=64)
+    assert text.getvalue() == binary.getvalue().decode() == JsonSchemaParser(schema, json_backend='stdlib').dumps(obj)
+
+    binary = io.BytesIO()
+    dump({'a': uuid.UUID(int=1)}, binary)
+    assert json.loads(binary.getvalue()) == {'a': str(uuid.UUID(int=1))}
+
+
+def test_iter_dumps_keys():
+    obj = {True: 1, False: 2, None: 3, 1.5: 4, 2: 5, 'a': 6}
+    parser = JsonSchemaParser({'type': 'object'})
+
+    assert ''.join(parser.iter_dumps(obj)) == json.dumps(obj)
+    assert ''.join(parser.iter_dumps({**obj, (1, 2): 7}, skipkeys=True)) == json.dumps(obj)
+    with pytest.raises(TypeError):
+        list(parser.iter_dumps({(1, 2): 7}))
+
+
+@pytest.mark.parametrize('keyword', ['anyOf', 'oneOf'])
+def test_iter_dumps_composition(keyword):
+    schema = {keyword: [{'type': 'null'}, {'type': 'array', 'items': {'type': 'string', 'format': 'uuid'}}]}
+    obj = [uuid.UUID(int=i) for i in range(10)]
+    parser = JsonSchemaParser(schema)
+
+    # the value of the picked sub schema is split as well
+    chunks = list(parser.iter_dumps(obj, chunk_size=1))
+    assert len(chunks) > 10
+    assert ''.join(chunks) == parser.dumps(obj)
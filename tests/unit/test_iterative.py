@@ -0,0 +1,156 @@
+import pickle
+import sys
+
+import pytest
+
+from pyjschema import JsonSchemaParser
+from pyjschema.string.formatter import DateFormat
+
+TREE_SCHEMA = {
+    '$defs': {
+        'node': {
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'integer'},
+                'children': {'type': 'array', 'items': {'$ref': '#/$defs/node'}},
+            },
+            'required': ['id'],
+            'additionalProperties': False
+        }
+    },
+    '$ref': '#/$defs/node'
+}
+ID = '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'
+
+
+def _deep_tree(depth: int) -> dict:
+    tree = {'id': depth}
+    for i in range(depth - 1, 0, -1):
+        tree = {'id': i, 'children': [tree]}
+
+    return tree
+
+
+def test_deep_document():
+    depth = sys.getrecursionlimit() * 2
+    tree = _deep_tree(depth)
+
+    with pytest.raises(RecursionError):
+        JsonSchemaParser(TREE_SCHEMA).parse(tree)
+
+    parser = JsonSchemaParser(TREE_SCHEMA, backend='iterative')
+    ret = parser.parse(tree)
+    for i in range(1, depth):
+        assert ret['id'] == i
+        ret, = ret['children']
+    assert ret == {'id': depth}
+
+    assert parser.is_valid(tree)
+    parser.validate(tree)
+
+    # the deepest node is invalid
+    node = tree
+    while 'children' in node:
+        node, = node['children']
+    node['id'] = 'not an integer'
+    assert not parser.is_valid(tree)
+    with pytest.raises(ValueError):
+        parser.parse(tree)
+
+
+def test_max_depth():
+    # every tree node is an object and an array level
+    parser = JsonSchemaParser(TREE_SCHEMA, backend='iterative', max_depth=10)
+    assert parser.parse(_deep_tree(5))
+    with pytest.raises(ValueError, match='deeper than 10'):
+        parser.parse(_deep_tree(6))
+    assert not parser.is_valid(_deep_tree(6))
+
+    # the limit is not a failing "anyOf" option, it fails the whole document
+    schema = {'$defs': TREE_SCHEMA['$defs'], 'anyOf': [{'$ref': '#/$defs/node'}, {'type': 'integer'}]}
+    parser = JsonSchemaParser(schema, backend='iterative', max_depth=10)
+    with pytest.raises(ValueError, match='deeper than 10'):
+        parser.parse(_deep_tree(6))
+
+    parser = pickle.loads(pickle.dumps(parser))
+    with pytest.raises(ValueError, match='deeper than 10'):
+        parser.parse(_deep_tree(6))
+
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'kind': {'enum': ['a', 'b']},
+        'at': {'type': 'string', 'format': 'date'},
+        'values': {
+            'type': 'array',
+            'prefixItems': [{'type': 'string'}],
+            'items': {'type': 'number'},
+            'contains': {'type': 'number', 'minimum': 10},
+            'uniqueItems': True
+        },
+        'shape': {
+            'oneOf': [
+                {'type': 'object', 'properties': {'type': {'const': 'circle'}, 'r': {'type': 'number'}},
+                 'required': ['type', 'r']},
+                {'type': 'object', 'properties': {'type': {'const': 'square'}, 'side': {'type': 'number'}},
+                 'required': ['type', 'side']},
+            ]
+        },
+        'any': {'anyOf': [{'type': 'string', 'format': 'uuid'}, {'type': 'string'}]},
+        'not': {'not': {'type': 'array', 'items': {'type': 'string'}}},
+    },
+    'patternProperties': {'^x-': {'type': 'integer'}},
+    'additionalProperties': {'type': 'boolean'},
+    'dependentSchemas': {'kind': {'required': ['at']}},
+    'if': {'properties': {'kind': {'const': 'a'}}},
+    'then': {'required': ['values']},
+    'else': {'required': ['shape']},
+}
+
+
+@pytest.mark.parametrize('obj', [
+    {'kind': 'a', 'at': '2024-01-02', 'values': ['x', 1, 12]},
+    {'kind': 'b', 'at': '2024-01-02', 'shape': {'type': 'circle', 'r': 1}},
+    {'shape': {'type': 'square', 'side': 2}, 'any': ID, 'x-a': 1, 'flag': True},
+    {'shape': {'type': 'square', 'side': 2}, 'any': 'text', 'not': [1]},
+    {'kind': 'a', 'values': ['x', 12]},
+    {'kind': 'a', 'at': '2024-01-02', 'values': ['x', 1]},
+    {'kind': 'a', 'at': '2024-01-02', 'values': ['x', 12, 12]},
+    {'kind': 'c', 'at': '2024-01-02', 'shape': {'type': 'circle', 'r': 1}},
+    {'kind': 'b', 'at': '2024-01-02'},
+    {'shape': {'type': 'triangle'}},
+    {'shape': {'type': 'circle', 'r': 1}, 'not': ['a']},
+    {'shape': {'type': 'circle', 'r': 1}, 'x-a': 1.5},
+    {'shape': {'type': 'circle', 'r': 1}, 'flag': 1},
+    [],
+])
+@pytest.mark.parametrize('records', [False, True])
+def test_same_as_interpreter(obj, records):
+    interpreter = JsonSchemaParser(SCHEMA, records=records)
+    iterative = JsonSchemaParser(SCHEMA, backend='iterative', records=records)
+
+    assert iterative.is_valid(obj) == interpreter.is_valid(obj)
+    if interpreter.is_valid(obj):
+        iterative.validate(obj)
+        assert iterative.parse(obj) == interpreter.parse(obj)
+        assert type(iterative.parse(obj)) is type(interpreter.parse(obj))
+    else:
+        with pytest.raises(ValueError):
+            iterative.validate(obj)
+        with pytest.raises(ValueError):
+            iterative.parse(obj)
+
+
+def test_validate_does_not_parse(monkeypatch):
+    def decode(self, raw):
+        raise AssertionError('validating should not decode formats')
+
+    monkeypatch.setattr(DateFormat, 'decode', decode)
+    parser = JsonSchemaParser(SCHEMA, backend='iterative', records=True)
+    obj = {'kind': 'a', 'at': '2024-01-02', 'values': ['x', 1, 12]}
+
+    assert parser.is_valid(obj)
+    parser.validate(obj)
+    with pytest.raises(ValueError, match='should not decode'):
+        parser.parse(obj)
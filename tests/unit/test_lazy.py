@@ -0,0 +1,103 @@
+import io
+import uuid
+from datetime import datetime
+
+import pytest
+
+from pyjschema import Formatter, JsonSchemaParser
+from pyjschema.string.formatter import DatetimeFormat, TimeFormat, DateFormat, Ipv6Formatter, EmailFormatter
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string', 'format': 'uuid'},
+        'created': {'type': 'string', 'format': 'date-time'},
+        'hosts': {'type': 'array', 'items': {'type': 'string', 'format': 'ipv4'}},
+        'nested': {'type': 'object', 'properties': {'id': {'type': 'string', 'format': 'uuid'}}},
+    }
+}
+
+RAW = '''{
+    "id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a",
+    "created": "2018-11-13T20:20:39+00:00",
+    "hosts": ["1.1.1.1", "2.2.2.2"],
+    "nested": {"id": "9449771f-56ca-44c7-b9f6-d20315a2c6e0"},
+    "other": 1
+}'''
+
+
+def test_lazy():
+    lazy = JsonSchemaParser(SCHEMA, lazy=True).loads(RAW)
+    eager = JsonSchemaParser(SCHEMA).loads(RAW)
+
+    assert lazy['id'] == uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')
+    assert isinstance(lazy['created'], datetime)
+    assert lazy['hosts'][1:] == eager['hosts'][1:]
+    assert lazy == eager
+    assert dict(lazy['nested']) == eager['nested']
+    assert len(lazy) == 5 and 'other' in lazy
+
+
+def test_lazy_invalid():
+    parser = JsonSchemaParser(SCHEMA, lazy=True)
+
+    with pytest.raises(ValueError):
+        parser.parse({'id': 'not a uuid'})
+
+    with pytest.raises(ValueError):
+        parser.parse({'hosts': ['1.1.1.400']})
+
+    with pytest.raises(ValueError):
+        JsonSchemaParser(SCHEMA, backend='codegen', lazy=True)
+
+
+def test_lazy_decodes_on_access(counting_formatter):
+    schema = {'type': 'array', 'items': {'type': 'string', 'format': 'counting'}}
+    parser = JsonSchemaParser(schema, extended_formats=[counting_formatter], lazy=True)
+
+    result = parser.parse(['a', 'b', 'c'])
+    assert counting_formatter.decoded == 0
+    assert result[1] == 'B'
+    assert result[1] == 'B'
+    assert counting_formatter.decoded == 1
+
+    assert list(parser.iter_items(io.StringIO('["d"]'))) == ['D']
+    assert JsonSchemaParser(schema['items'], extended_formats=[counting_formatter], lazy=True).parse('e') == 'E'
+
+
+def test_lazy_decodes_once():
+    # a format that is checked by decoding it is decoded right away and not again when it is read
+    class DecodeCheckedFormatter(Formatter):
+        symbol = 'decode-checked'
+        decoded = 0
+
+        def decode(self, raw: str) -> str:
+            DecodeCheckedFormatter.decoded += 1
+            return raw.upper()
+
+    schema = {'type': 'object', 'properties': {'a': {'type': 'string', 'format': 'decode-checked'}}}
+    parser = JsonSchemaParser(schema, extended_formats=[DecodeCheckedFormatter], lazy=True)
+
+    ret = parser.parse({'a': 'x'})
+    assert DecodeCheckedFormatter.decoded == 1
+    assert ret['a'] == 'X'
+    assert DecodeCheckedFormatter.decoded == 1
+
+
+@pytest.mark.parametrize('formatter, raw', [
+    (DatetimeFormat, '2018-11-13T20:20:39Z'),
+    (TimeFormat, '20:20:39.123+02:00'),
+    (DateFormat, '2024-02-29'),
+    (Ipv6Formatter, '2001:db8::1'),
+    (EmailFormatter, 'test12@gmail.com'),
+])
+def test_lazy_defers_formats(monkeypatch, formatter, raw):
+    decode = formatter.decode
+    decoded = []
+    monkeypatch.setattr(formatter, 'decode', lambda self, s: decoded.append(s) or decode(self, s))
+
+    parser = JsonSchemaParser({'type': 'array', 'items': {'type': 'string', 'format': formatter.symbol}}, lazy=True)
+    result = parser.parse([raw])
+    assert decoded == []
+    assert result[0] == decode(formatter(), raw)
+    assert decoded == [raw]
@@ -1,6 +1,14 @@
+import uuid
+from copy import deepcopy
+from datetime import date
+
 import pytest
 
-from pyjschema.load import loads
+from pyjschema.cache import DEFAULT_CACHE_SIZE
+from pyjschema.load import loads, loado, loads_many, get_parser, clear_cache, cache_info, set_cache_size, \
+    JsonSchemaParser
+from pyjschema.string import DEFAULT_FORMATS
+from pyjschema.string.formatter import EmailFormatter
 
 
 def test_bool():
@@ -54,3 +62,146 @@ def test_const():
     loads('{ "country": "United States of America" }', schema)
     with pytest.raises(ValueError):
         loads('{ "country": "Canada" }', schema)
+
+    assert loads('1.0', {'const': 1}) == 1
+    assert loads('{"b": [1, {"c": null}], "a": true}', {'const': {'a': True, 'b': [1.0, {'c': None}]}})
+    for raw in ('true', '"1"', '[1]'):
+        with pytest.raises(ValueError):
+            loads(raw, {'const': 1})
+    with pytest.raises(ValueError):
+        loads('{"a": 1, "b": [1, {"c": null}]}', {'const': {'a': True, 'b': [1, {'c': None}]}})
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+def test_enum(backend):
+    codes = [f'C{i:04}' for i in range(5000)]
+    parser = JsonSchemaParser({'type': 'array', 'items': {'type': 'string', 'enum': codes}}, backend=backend)
+
+    assert parser.loads('["C0000", "C4999"]') == ['C0000', 'C4999']
+    with pytest.raises(ValueError):
+        parser.loads('["C5000"]')
+
+    parser = JsonSchemaParser({'enum': [1, 'a', None, [1, 2], {'x': False}]}, backend=backend)
+    for obj in (1, 1.0, 'a', None, [1, 2], {'x': False}):
+        assert parser.parse(obj) == obj and parser.is_valid(obj)
+    for obj in (True, False, 0, [2, 1], {'x': 0}, {'x': False, 'y': 1}):
+        assert not parser.is_valid(obj)
+        with pytest.raises(ValueError):
+            parser.parse(obj)
+
+    parser = JsonSchemaParser({'type': 'string', 'format': 'date', 'enum': ['2020-01-01', '2020-01-0x']},
+                              backend=backend)
+    assert parser.parse('2020-01-01') == date(2020, 1, 1)
+    with pytest.raises(ValueError):
+        parser.parse('2020-01-0x')
+
+
+def test_parser_reuse():
+    schema = {
+        'type': 'array',
+        'items': {'anyOf': [{'type': 'string'}, {'type': 'number'}]}
+    }
+    parser = JsonSchemaParser(schema)
+
+    assert parser.parse(['a', 1, 'b', 2]) == ['a', 1, 'b', 2]
+    assert parser.loads('["a", 1]') == ['a', 1]
+    with pytest.raises(ValueError):
+        parser.parse(['a', 1, None])
+
+    with pytest.raises(ValueError):
+        parser.parse([None, 'a'])
+
+
+def test_schema_not_mutated():
+    schema = {
+        '$defs': {'positive': {'type': 'number', 'not': {'maximum': 0}}},
+        'type': 'object',
+        'properties': {'a': {'$ref': '#/$defs/positive'}, 'b': {'$ref': '#/$defs/positive'}}
+    }
+    orig = deepcopy(schema)
+
+    loads('{"a": 1, "b": 2}', schema)
+    with pytest.raises(ValueError):
+        loads('{"a": 1, "b": -2}', schema)
+
+    assert schema == orig
+
+
+def test_many():
+    parser = JsonSchemaParser({'type': 'string', 'format': 'uuid'})
+    raws = ['"3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a"', '"not a uuid"', '1', 'not a json']
+
+    assert parser.loads_many(raws[:1]) == [uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')]
+    with pytest.raises(ValueError):
+        parser.loads_many(raws)
+
+    result = parser.loads_many(iter(raws), raise_errors=False)
+    assert result[0] == uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')
+    assert all(isinstance(error, ValueError) for error in result[1:])
+
+    result = parser.parse_many(['3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a', 1], raise_errors=False)
+    assert result[0] == uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')
+    assert isinstance(result[1], ValueError)
+
+    assert loads_many(['1', '2'], {'type': 'number'}) == [1, 2]
+
+
+def test_parsers_cache():
+    clear_cache()
+    schema = {'type': 'object', 'properties': {'id': {'type': 'string', 'format': 'uuid'}}}
+    raw = '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a"}'
+
+    assert loads(raw, schema) == loads(raw, {'properties': schema['properties'], 'type': 'object'})
+    assert loado({'id': '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'}, schema) == loads(raw, schema)
+    # the order of the keys is part of the key
+    assert cache_info() == (2, 2, DEFAULT_CACHE_SIZE, 2)
+    assert get_parser(schema) is get_parser(deepcopy(schema))
+
+    # the first matching pattern is used, so schemas that differ only in the patterns' order are different parsers
+    patterns = {'^a': {'type': 'integer'}, 'b': {'type': 'string'}}
+    assert loads('{"ab": 1}', {'type': 'object', 'patternProperties': patterns}) == {'ab': 1}
+    assert loads('{"ab": "x"}', {'type': 'object', 'patternProperties': dict(reversed(patterns.items()))}) == \
+        {'ab': 'x'}
+
+    # the cached parser does not change with the schema
+    schema['properties']['id']['format'] = 'date'
+    assert isinstance(loads(raw, {'type': 'object', 'properties': {'id': {'format': 'uuid', 'type': 'string'}}})['id'],
+                      uuid.UUID)
+
+    set_cache_size(2)
+    for i in range(3):
+        loads('1', {'type': 'number', 'minimum': -i})
+    assert cache_info().currsize == 2
+
+    set_cache_size(0)
+    assert get_parser(schema) is not get_parser(schema)
+
+    set_cache_size(DEFAULT_CACHE_SIZE)
+    clear_cache()
+    assert cache_info() == (0, 0, DEFAULT_CACHE_SIZE, 0)
+
+
+def test_parsers_cache_identity(monkeypatch):
+    clear_cache()
+    schema = {'type': 'object', 'properties': {'id': {'type': 'string', 'format': 'uuid'}}}
+    parser = get_parser(schema)
+
+    # a schema object that was passed already is not serialized again
+    calls = []
+    monkeypatch.setattr('pyjschema.load.fingerprint', lambda *args: calls.append(args))
+    assert get_parser(schema) is parser
+    assert loads('{}', schema) == {}
+    assert calls == []
+
+    # but a different object is
+    get_parser(deepcopy(schema))
+    assert len(calls) == 1
+    clear_cache()
+
+
+def test_default_formats_not_mutated():
+    formats = list(DEFAULT_FORMATS)
+    JsonSchemaParser({'type': 'string'}, extended_formats=[EmailFormatter])
+    JsonSchemaParser({'type': 'string'}, extended_formats=[EmailFormatter])
+
+    assert DEFAULT_FORMATS == formats
@@ -1,6 +1,9 @@
+import re
+
 import pytest
 
-from pyjschema.load import loads
+from pyjschema.load import loads, JsonSchemaParser
+from pyjschema.object import _combine_patterns
 
 
 def test_properties():
@@ -256,3 +259,50 @@ def test_if_then_else():
           "street_address": "1600 Pennsylvania Avenue NW",
           "postal_code": "K1M 1M4"
         }''', schema)
+
+
+def test_pattern_properties_order():
+    # the first pattern found in the key applies, even if a later pattern matches earlier in the key
+    schema = {
+        "type": "object",
+        "patternProperties": {
+            "b": {"type": "string"},
+            "^a": {"type": "integer"},
+            "(x)\\1": {"type": "boolean"}
+        }
+    }
+
+    for backend in ('interpreter', 'codegen'):
+        parser = JsonSchemaParser(schema, backend=backend)
+        assert parser.loads('{"ab": "s", "ac": 1, "xx": true}') == {"ab": "s", "ac": 1, "xx": True}
+        with pytest.raises(ValueError):
+            parser.loads('{"ab": 1}')
+
+        with pytest.raises(ValueError):
+            parser.loads('{"axx": "s"}')
+
+        with pytest.raises(ValueError):
+            parser.loads('{"xx": 1}')
+
+    schema['patternProperties'].pop('(x)\\1')
+    for backend in ('interpreter', 'codegen'):
+        parser = JsonSchemaParser(schema, backend=backend)
+        assert parser.loads('{"ab": "s", "ac": 1, "xx": true}') == {"ab": "s", "ac": 1, "xx": True}
+        with pytest.raises(ValueError):
+            parser.loads('{"ab": 1}')
+
+        with pytest.raises(ValueError):
+            parser.loads('{"ac": "s"}')
+
+
+def test_pattern_properties_inline_flags():
+    # an inline flag applies only to its own pattern
+    schema = {'type': 'object', 'patternProperties': {'^a': {'type': 'integer'}, '(?i)b': {'type': 'string'}}}
+    assert _combine_patterns([re.compile(pattern) for pattern in schema['patternProperties']]) is None
+    assert _combine_patterns([re.compile('^a'), re.compile('b', re.IGNORECASE)]) is None
+
+    for backend in ('interpreter', 'codegen'):
+        parser = JsonSchemaParser(schema, backend=backend)
+        assert parser.loads('{"A": "x", "B": "y", "a": 1}') == {"A": "x", "B": "y", "a": 1}
+        with pytest.raises(ValueError):
+            parser.loads('{"B": 1}')
@@ -0,0 +1,38 @@
+import pickle
+import uuid
+
+import pytest
+
+from pyjschema import JsonSchemaParser
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {'id': {'type': 'string', 'format': 'uuid'}, 'name': {'type': 'string', 'pattern': '^[a-z]+$'}},
+    'required': ['id']
+}
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+def test_pickle(backend):
+    parser = pickle.loads(pickle.dumps(JsonSchemaParser(SCHEMA, backend=backend)))
+
+    assert parser.parse({'id': '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'}) == \
+        {'id': uuid.UUID('3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a')}
+    with pytest.raises(ValueError):
+        parser.parse({'id': '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a', 'name': 'A'})
+
+
+def test_parse_parallel():
+    ids = [uuid.uuid4() for _ in range(50)]
+    raws = [f'{{"id": "{i}", "name": "abc"}}'.encode() for i in ids]
+    parser = JsonSchemaParser(SCHEMA)
+
+    assert parser.parse_parallel(raws, workers=2, chunksize=7) == [{'id': i, 'name': 'abc'} for i in ids]
+
+    raws[3] = b'{"name": "abc"}'
+    with pytest.raises(ValueError):
+        parser.parse_parallel(raws, workers=2, chunksize=7)
+
+    result = parser.parse_parallel(iter(raws), workers=2, chunksize=7, raise_errors=False)
+    assert isinstance(result[3], ValueError)
+    assert result[4] == {'id': ids[4], 'name': 'abc'}
@@ -0,0 +1,82 @@
+import pickle
+import sys
+import uuid
+
+import pytest
+
+from pyjschema import JsonSchemaParser, Record
+
+SCHEMA = {
+    'title': 'Event',
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string', 'format': 'uuid'},
+        'name': {'type': 'string'},
+        'first-seen': {'type': 'number'},
+        'tags': {'type': 'array', 'items': {'type': 'object', 'properties': {'key': {'type': 'string'}}}},
+    },
+    'required': ['id'],
+    'additionalProperties': False
+}
+ID = '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+def test_records(backend):
+    parser = JsonSchemaParser(SCHEMA, backend=backend, records=True)
+
+    record = parser.parse({'id': ID, 'name': 'a', 'first-seen': 1.5, 'tags': [{'key': 'k', 'x': 1}]})
+    assert isinstance(record, Record) and type(record).__name__ == 'Event'
+    assert record.id == record['id'] == uuid.UUID(ID)
+    assert record.name == 'a' and record['first-seen'] == 1.5
+    assert record.tags[0].key == 'k' and record.tags[0]['x'] == 1
+    assert record == {'id': uuid.UUID(ID), 'name': 'a', 'first-seen': 1.5, 'tags': [{'key': 'k', 'x': 1}]}
+    assert not hasattr(record, '__dict__')
+
+    record = parser.parse({'id': ID})
+    assert record == {'id': uuid.UUID(ID)} and len(record) == 1
+    assert 'name' not in record and not hasattr(record, 'name')
+    with pytest.raises(KeyError):
+        record['name']
+
+    with pytest.raises(ValueError):
+        parser.parse({'id': ID, 'other': 1})
+
+
+def test_record_shape():
+    parser = JsonSchemaParser(SCHEMA, records=True)
+    record = parser.parse({'id': ID, 'name': 'a'})
+
+    assert type(parser.parse({'id': ID})) is type(record)
+    assert type(JsonSchemaParser(SCHEMA, records=True).parse({'id': ID})) is type(record)
+    assert type(record).__slots__ == ('id', 'name', 'tags', '_extra')
+    assert sys.getsizeof(record) < sys.getsizeof(record._asdict())
+
+    closed = JsonSchemaParser({'type': 'object', 'properties': {'a': {}}, 'additionalProperties': False}, records=True)
+    assert type(closed.parse({'a': 1})).__slots__ == ('a',)
+
+    unpickled = pickle.loads(pickle.dumps(record))
+    assert unpickled == record and type(unpickled) is type(record)
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen', 'iterative'])
+def test_record_attribute_names(backend):
+    # properties named like the attributes of Record are held in the side dict
+    schema = {'type': 'object', 'properties': {'from_dict': {'type': 'integer'}, 'a': {}}, 'additionalProperties': False}
+    parser = JsonSchemaParser(schema, backend=backend, records=True)
+
+    record = parser.parse({'from_dict': 1, 'a': 2})
+    assert type(record).__slots__ == ('a', '_extra')
+    assert record['from_dict'] == 1 and record.a == 2
+    assert record == {'from_dict': 1, 'a': 2}
+
+
+def test_records_dumps():
+    parser = JsonSchemaParser(SCHEMA, records=True)
+    record = parser.parse({'id': ID, 'first-seen': 2, 'tags': [{'key': 'k'}]})
+
+    assert parser.loads(parser.dumps(record)) == record
+    assert ''.join(parser.iter_dumps(record)) == JsonSchemaParser(SCHEMA, json_backend='stdlib').dumps(record)
+
+    with pytest.raises(ValueError):
+        JsonSchemaParser(SCHEMA, records=True, lazy=True)
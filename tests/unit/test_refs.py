@@ -1,6 +1,6 @@
 import pytest
 
-from pyjschema.load import loads
+from pyjschema.load import loads, JsonSchemaParser
 
 
 def test_refs():
@@ -56,3 +56,101 @@ def test_recursion():
           ]
         }
         ''', schema)
+
+
+def test_pointer_escaping():
+    schema = {
+        "type": "object",
+        "properties": {
+            "slash": {"$ref": "#/$defs/a~1b"},
+            "tilde": {"$ref": "#/$defs/c~0d"},
+            "percent": {"$ref": "#/$defs/e%25f"},
+            "item": {"$ref": "#/$defs/list/1"},
+        },
+        "$defs": {
+            "a/b": {"type": "string"},
+            "c~d": {"type": "number"},
+            "e%f": {"type": "boolean"},
+            "list": [{"type": "string"}, {"type": "null"}]
+        }
+    }
+
+    loads('{"slash": "s", "tilde": 1, "percent": true, "item": null}', schema)
+    with pytest.raises(ValueError):
+        loads('{"slash": 1}', schema)
+
+    with pytest.raises(ValueError):
+        loads('{"tilde": "1"}', schema)
+
+    with pytest.raises(ValueError):
+        loads('{"item": "s"}', schema)
+
+
+def test_id_and_anchor():
+    schema = {
+        "$id": "https://example.com/schemas/root",
+        "type": "object",
+        "properties": {
+            "address": {"$ref": "address"},
+            "street": {"$ref": "address#/properties/street"},
+            "name": {"$ref": "#name"},
+            "age": {"$ref": "https://example.com/schemas/root#/$defs/age"},
+        },
+        "$defs": {
+            "address": {
+                "$id": "address",
+                "type": "object",
+                "properties": {"street": {"type": "string"}, "city": {"$ref": "#/$defs/city"}},
+                "$defs": {"city": {"type": "string", "minLength": 2}}
+            },
+            "name": {"$anchor": "name", "type": "string"},
+            "age": {"type": "integer"},
+        }
+    }
+
+    loads('{"address": {"street": "a", "city": "TLV"}, "street": "b", "name": "c", "age": 3}', schema)
+    with pytest.raises(ValueError):
+        loads('{"address": {"city": "T"}}', schema)
+
+    with pytest.raises(ValueError):
+        loads('{"street": 1}', schema)
+
+    with pytest.raises(ValueError):
+        loads('{"name": 1}', schema)
+
+    with pytest.raises(ValueError):
+        loads('{"age": "3"}', schema)
+
+
+def test_recursive_defs():
+    schema = {
+        "$ref": "#/$defs/node",
+        "$defs": {
+            "node": {
+                "type": "object",
+                "properties": {"value": {"type": "number"}, "next": {"$ref": "#/$defs/node"}}
+            }
+        }
+    }
+    parser = JsonSchemaParser(schema)
+
+    doc = {"value": 0}
+    for i in range(1, 50):
+        doc = {"value": i, "next": doc}
+
+    assert parser.parse(doc) == doc
+    with pytest.raises(ValueError):
+        parser.parse({"value": 1, "next": {"value": "2"}})
+
+    assert JsonSchemaParser(schema, backend='codegen').parse(doc) == doc
+
+
+def test_unresolvable_refs():
+    with pytest.raises(ValueError):
+        JsonSchemaParser({"$ref": "#/$defs/missing"})
+
+    with pytest.raises(ValueError):
+        JsonSchemaParser({"$ref": "https://example.com/other"})
+
+    with pytest.raises(ValueError):
+        JsonSchemaParser({"$ref": "#"})
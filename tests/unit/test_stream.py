@@ -0,0 +1,110 @@
+import io
+import itertools
+import json
+import uuid
+
+import pytest
+
+from pyjschema import iter_load, iter_items, load_file, JsonSchemaParser
+
+SCHEMA = {'type': 'object', 'properties': {'id': {'type': 'string', 'format': 'uuid'}}, 'required': ['id']}
+RECORDS = [{'id': uuid.uuid4()} for _ in range(100)]
+NDJSON = ''.join(f'{{"id": "{record["id"]}"}}\n' for record in RECORDS)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 20])
+def test_iter_load(chunk_size):
+    parser = JsonSchemaParser(SCHEMA)
+
+    assert list(parser.iter_load(io.StringIO(NDJSON), chunk_size=chunk_size)) == RECORDS
+    assert list(parser.iter_load(io.BytesIO(NDJSON.encode()), chunk_size=chunk_size)) == RECORDS
+    assert list(parser.iter_load(io.BytesIO(NDJSON.rstrip('\n').encode()), chunk_size=chunk_size)) == RECORDS
+    assert list(iter_load(io.BytesIO(NDJSON.replace('\n', '\r\n\n').encode()), SCHEMA, chunk_size=chunk_size)) == \
+        RECORDS
+
+
+def test_iter_load_invalid():
+    record = '{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a"}'
+    raw = f'{record}\n{{"id": 1}}\nnot json\n{record}'
+    parser = JsonSchemaParser(SCHEMA)
+
+    with pytest.raises(ValueError, match='line 2'):
+        list(parser.iter_load(io.BytesIO(raw.encode())))
+
+    assert len(list(parser.iter_load(io.BytesIO(raw.encode()), skip_invalid=True))) == 2
+
+    result = list(parser.iter_load(io.StringIO(raw), raise_errors=False))
+    assert [isinstance(record, ValueError) for record in result] == [False, True, True, False]
+    assert 'line 3' in str(result[2])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 20])
+def test_iter_items(chunk_size):
+    schema = {
+        'type': 'object',
+        'properties': {
+            'items': {'type': 'array', 'items': SCHEMA, 'maxItems': 100},
+        }
+    }
+    raw = json.dumps({'meta': {'a': [1, ']}\\"', {}], 'b': 2.5e3}, 'items': [{'id': str(r['id'])} for r in RECORDS]})
+    parser = JsonSchemaParser(schema)
+
+    assert list(parser.iter_items(io.StringIO(raw), path=('items',), chunk_size=chunk_size)) == RECORDS
+    assert list(iter_items(io.BytesIO(raw.encode()), schema, path=('items',), chunk_size=chunk_size)) == RECORDS
+
+    raw = json.dumps([1, "a\\u00e9א", None, True, [{"x": "["}], -1.5e-3])
+    assert list(iter_items(io.BytesIO(raw.encode()), chunk_size=chunk_size)) == json.loads(raw)
+    assert list(iter_items(io.StringIO('[ ]'), chunk_size=chunk_size)) == []
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3])
+def test_iter_items_split_characters(chunk_size):
+    # reads that end inside a multibyte character are not the end of the stream
+    raw = json.dumps(['é', 'אב', '€ and 😀', {'k': 'ü'}], ensure_ascii=False).encode()
+    assert list(JsonSchemaParser().iter_items(io.BytesIO(raw), chunk_size=chunk_size)) == json.loads(raw)
+
+
+def test_iter_items_invalid():
+    schema = {'type': 'array', 'prefixItems': [{'type': 'string'}], 'items': {'type': 'number'}, 'maxItems': 3}
+    parser = JsonSchemaParser(schema)
+
+    items = parser.iter_items(io.StringIO('["a", 1, "b", 3]'))
+    assert next(items) == 'a'
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
+
+    items = parser.iter_items(io.StringIO('["a", 1, 2, 3, ' + 'x' * 100))
+    assert list(itertools.islice(items, 3)) == ['a', 1, 2]
+    with pytest.raises(ValueError):
+        next(items)
+
+    with pytest.raises(ValueError):
+        list(parser.iter_items(io.StringIO('["a", 1')))
+
+    with pytest.raises(ValueError):
+        list(parser.iter_items(io.StringIO('{"items": []}'), path=('other',)))
+
+    with pytest.raises(ValueError):
+        list(JsonSchemaParser({'type': 'array', 'minItems': 2}).iter_items(io.StringIO('[1]')))
+
+
+@pytest.mark.parametrize('json_backend', ['stdlib', None])
+def test_load_file(tmp_path, json_backend):
+    parser = JsonSchemaParser({'type': 'array', 'items': SCHEMA}, json_backend=json_backend)
+    array_path, lines_path, empty_path = tmp_path / 'array.json', tmp_path / 'lines.ndjson', tmp_path / 'empty.json'
+    array_path.write_text(json.dumps([{'id': str(record['id'])} for record in RECORDS]))
+    lines_path.write_text(NDJSON)
+    empty_path.write_bytes(b'')
+
+    assert parser.load_file(array_path) == RECORDS
+    assert load_file(str(array_path), {'type': 'array', 'items': SCHEMA}) == RECORDS
+    assert list(parser.iter_items_file(array_path, chunk_size=64)) == RECORDS
+    assert list(JsonSchemaParser(SCHEMA, json_backend=json_backend).iter_load_file(lines_path, chunk_size=64)) == \
+        RECORDS
+
+    with pytest.raises(ValueError):
+        parser.load_file(empty_path)
+    assert list(parser.iter_load_file(empty_path)) == []
+    with pytest.raises(FileNotFoundError):
+        parser.load_file(tmp_path / 'missing.json')
@@ -1,12 +1,14 @@
+import pickle
 import uuid
 from base64 import b64decode, b64encode
-from datetime import time, datetime, timedelta
+from datetime import time, datetime, timedelta, date, timezone
 from ipaddress import IPv4Address, IPv6Address
 
 import pytest
 
 from pyjschema import Formatter
 from pyjschema.load import loads, JsonSchemaParser
+from pyjschema.string.formatter import UUIDFormat
 
 
 def test_string():
@@ -46,12 +48,48 @@ def test_duration():
     schema = {'type': 'string', 'format': 'duration'}
 
     assert loads(f'"P3DT12H"', schema) == timedelta(days=3, hours=12)
+    assert loads(f'"P1W2DT1H30M4.5S"', schema) == timedelta(weeks=1, days=2, hours=1, minutes=30, seconds=4.5)
+    assert loads(f'"PT0,5S"', schema) == timedelta(seconds=0.5)
+
+    parser = JsonSchemaParser({'type': 'array', 'items': schema})
+    durations = [timedelta(seconds=10), timedelta(minutes=1), timedelta(days=3, hours=12), timedelta(seconds=1.5)]
+    assert parser.loads(parser.dumps(durations)) == durations
+
+    # the last ones are beyond the range of timedelta
+    for raw in ('"P"', '"PT"', '"P1DT"', '"3D"', '"P1Y"', '"P2M"', '"P1H"', '"P\u0663D"', '"P9999999999D"',
+                '"PT99999999999999999999S"'):
+        with pytest.raises(ValueError):
+            loads(raw, schema)
+        assert not parser.is_valid([raw.strip('"')])
+    assert loads('"P999999999DT23H59M59S"', schema) == timedelta(days=999999999, seconds=86399)
+
+
+def test_date():
+    schema = {'type': 'string', 'format': 'date'}
+
+    assert loads('"2018-11-13"', schema) == date(2018, 11, 13)
+    assert JsonSchemaParser(schema).dumps(date(5, 1, 2)) == '"0005-01-02"'
+    for raw in ('"2018-11-32"', '"2018-1-13"', '"20181113"', '"2018-11-13T00:00:00"', '"\u0662018-11-13"'):
+        with pytest.raises(ValueError):
+            loads(raw, schema)
+
+
+def test_hostname():
+    schema = {'type': 'string', 'format': 'hostname'}
+
+    assert loads('"api.eu-west-1.example.com"', schema) == 'api.eu-west-1.example.com'
+    assert loads('"example.com."', schema) == 'example.com.'
+    for raw in ('localhost', '-a.com', 'a-.com', 'a..com', f'{"a" * 64}.com', '.'.join(['a' * 60] * 5), 'a_b.com',
+                '\\u0661\\u0662\\u0663.com'):
+        with pytest.raises(ValueError):
+            loads(f'"{raw}"', schema)
 
 
 def test_datetime():
     schema = {'type': 'string', 'format': 'date-time'}
 
     assert isinstance(loads(f'"2018-11-13T20:20:39+00:00"', schema), datetime)
+    assert loads(f'"2018-11-13T20:20:39Z"', schema) == datetime(2018, 11, 13, 20, 20, 39, tzinfo=timezone.utc)
 
 
 def test_ipv4():
@@ -116,3 +154,26 @@ def test_extended_formats():
     decoded = parser.loads('"SGVsbG8gV29ybGQh"')
     assert isinstance(decoded, bytes)
     assert decoded == b'Hello World!'
+
+
+@pytest.mark.parametrize('backend', ['interpreter', 'codegen'])
+def test_format_cache(backend):
+    schema = {'type': 'array', 'items': {'type': 'string', 'format': 'uuid'}}
+    raws = ['3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a', '1e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'] * 3
+    parser = JsonSchemaParser(schema, backend=backend, format_cache_size=1)
+
+    result = parser.parse(raws[:1] * 3 + raws)
+    assert result == [uuid.UUID(raw) for raw in raws[:1] * 3 + raws]
+    assert result[0] is result[1] is result[2]
+    assert parser.format_cache_info()['uuid'] == (3, 6, 1, 1)
+    assert parser.format_cache_info()['date'] == (0, 0, 1, 0)
+
+    assert pickle.loads(pickle.dumps(parser)).format_cache_info()['uuid'] == (0, 0, 1, 0)
+    assert JsonSchemaParser(schema).format_cache_info() == {}
+
+    formatter = UUIDFormat(cache_size=2)
+    JsonSchemaParser(schema, extended_formats=[formatter], format_cache_size=5).parse(raws)
+    assert formatter.cache_info() == (4, 2, 2, 2)
+
+    with pytest.raises(ValueError):
+        Formatter(cache_size=10)
@@ -0,0 +1,39 @@
+import pytest
+
+from pyjschema import JsonSchemaParser
+from pyjschema.validate import validate_raw, validate_obj
+
+
+def test_validate():
+    schema = {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'string', 'format': 'uuid'},
+            'tags': {'type': 'array', 'items': {'type': 'string'}}
+        },
+        'required': ['id']
+    }
+
+    validate_raw('{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "tags": ["a"]}', schema)
+    validate_obj({'id': '3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a'}, schema)
+
+    with pytest.raises(ValueError, match='required'):
+        validate_obj({}, schema)
+
+    with pytest.raises(ValueError, match='uuid'):
+        validate_raw('{"id": "not a uuid"}', schema)
+
+    with pytest.raises(ValueError, match='not a string'):
+        validate_raw('{"id": "3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", "tags": [1]}', schema)
+
+
+def test_validate_does_not_decode(counting_formatter):
+    schema = {'type': 'array', 'items': {'type': 'string', 'format': 'counting'}}
+    parser = JsonSchemaParser(schema, extended_formats=[counting_formatter])
+
+    parser.validate(['a', 'b'])
+    assert parser.is_valid(['a', 'b'])
+    assert counting_formatter.decoded == 0
+
+    assert parser.parse(['a', 'b']) == ['A', 'B']
+    assert counting_formatter.decoded == 2